@@ -1,25 +1,36 @@
+import sys
 from enum import Enum
 from uuid import uuid4, UUID
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from .utils import OldVariableNamesMeta, generate_name_alias
 
 class BaseModel(metaclass=OldVariableNamesMeta):
+    # Declared fields live in slots; models list "__dict__" so ad-hoc attributes still work
+    __slots__ = ("__weakref__",)
+
+    @classmethod
+    def _merged_annotations(cls) -> Dict[str, Any]:
+        """
+        Annotations of the class and its ancestors, computed once per class.
+        Looked up in the class's own __dict__ so subclasses never reuse a parent's cache.
+        """
+        cached = cls.__dict__.get("__merged_annotations__")
+        if cached is not None:
+            return cached
+
+        # Walk MRO to include inherited fields
+        merged: Dict[str, Any] = {}
+        for klass in cls.__mro__:
+            merged.update(getattr(klass, "__annotations__", {}))
+        cls.__merged_annotations__ = merged
+        return merged
+
     def __getstate__(self) -> Dict[str, Any]:
         """
         When jsonpickle pickles us, export all public names from the class and its ancestors.
         """
-        state: Dict[str, Any] = {}
-        annotations: Dict[str, Any] = {}
-        
-        # Walk MRO to include inherited fields
-        for cls in self.__class__.__mro__:
-            annotations.update(getattr(cls, "__annotations__", {}))
-        
-        for public in annotations:
-            state[public] = getattr(self, public, None)
-        
-        return state
+        return {public: getattr(self, public, None) for public in self._merged_annotations()}
 
     def __setstate__(self, state: Dict[str, Any]):
         """
@@ -40,12 +51,21 @@ class Edge(BaseModel):
     name: str
     node_b: 'Node'
     node_a: 'Node'
+
+    # Reassigning an endpoint moves the edge between the nodes' adjacency lists
+    __watched_fields__ = ("node_a", "node_b")
+    __slots__ = ("__dict__",)
     
     def __init__(self, name, node_a, node_b):
         self.name = name
         self.node_a = node_a
         self.node_b = node_b
 
+    def _on_field_set(self, attr, old, new):
+        graph = getattr(old, "_graph", None)
+        if graph is not None:
+            graph._relink_edge(self, attr, old)
+
 class NodeType(Enum):
     UNDEFINED = 0
 
@@ -55,9 +75,13 @@ class Node(BaseModel):
     node_type: Optional[NodeType] = None
     parent: 'Node' = None
     id: uuid4 = None
-    edges: list[Edge] = None
-    
+
+    # Index keys; changes are forwarded to the owning graph (if any)
+    __watched_fields__ = ("name", "alias", "id", "parent")
+    __slots__ = ("__dict__", "_id_str", "_graph", "_order", "_out_edges", "_in_edges", "_children")
+
     def __init__(self, name:str, alias:str=None, id: str | UUID=None):
+        self._reset_links()
         self.name = name
         
         _alias = alias
@@ -65,25 +89,92 @@ class Node(BaseModel):
             _alias = generate_name_alias(name)
         self.alias = _alias
         
-        _id = id
-        if id and isinstance(id,str):
-            UUID(id)
+        # Always stored as a UUID; strings are validated and normalized
+        if isinstance(id, UUID):
+            _id = id
+        elif id and isinstance(id, str):
+            _id = UUID(id)
         else:
             _id = uuid4()
         self.id = _id
-    
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self._reset_links()
+        # `edges` used to be a stored (always empty) field; it is derived now
+        state.pop("edges", None)
+        node_id = state.get("id")
+        if isinstance(node_id, str):
+            # Older files may hold ids that were kept as plain strings
+            try:
+                state["id"] = UUID(node_id)
+            except ValueError:
+                pass
+        super().__setstate__(state)
+
+    def _reset_links(self):
+        # Graph membership and adjacency, owned by the graph; not serialized.
+        # `_order` (the node's position key in its graph) is set by the graph as well
+        self._graph = None
+        self._out_edges: list[Edge] = []
+        self._in_edges: list[Edge] = []
+        self._children: list[Node] = []
+
+    def _ensure_links(self):
+        # Subclasses whose __init__ skips Node.__init__ start without link state
+        if not hasattr(self, "_out_edges"):
+            self._reset_links()
+
+    @property
+    def edges(self) -> list[Edge]:
+        """Edges touching this node in its graph, outgoing first (self-loops once)."""
+        return self._out_edges + [e for e in self._in_edges if e.node_a is not self]
+
+    def _on_field_set(self, attr, old, new):
+        if attr == "id":
+            # Cached string form used by the id index and id matching
+            self._id_str = sys.intern(str(new))
+        elif attr in ("name", "alias") and type(new) is str:
+            # Index keys; interned so equal keys share one object and compare by identity
+            setattr(self, f"_{attr}", sys.intern(new))
+        graph = getattr(self, "_graph", None)
+        if graph is not None:
+            graph._reindex_node(self, attr, old)
+
+    # Per-field transforms applied when exporting rows
+    __csv_transforms__ = {"parent": lambda v: v.id if isinstance(v, Node) else v}
+
+    @classmethod
+    def _csv_spec(cls) -> list[tuple[str, Optional[Callable[[Any], Any]]]]:
+        """(field, transform) pairs for every exported field, computed once per class."""
+        cached = cls.__dict__.get("__csv_spec__")
+        if cached is not None:
+            return cached
+
+        transforms = getattr(cls, "__csv_transforms__", {})
+        spec = [(field, transforms.get(field)) for field in cls._merged_annotations()]
+        cls.__csv_spec__ = spec
+        return spec
+
     def as_dict(self):
-        return {
-            k: (v.id if isinstance(v, Node) and k == 'parent' else v)
-            for k, v in self.__dict__.items()
-            if not k.startswith('_')
-        }
+        return dict(zip(self.csv_headers(), self.as_csv()))
+
+    def _extra_fields(self) -> dict[str, Any]:
+        # Public ad-hoc attributes set on the instance, exported after the declared fields
+        extra = getattr(self, "__dict__", None)
+        if not extra:
+            return {}
+        return {k: v for k, v in extra.items() if not k.startswith('_')}
 
     def as_csv(self):
-        return list(self.as_dict().values())
+        row = []
+        for field, transform in self._csv_spec():
+            value = getattr(self, field, None)
+            row.append(transform(value) if transform else value)
+        row.extend(self._extra_fields().values())
+        return row
 
     def csv_headers(self):
-        return list(self.as_dict().keys())
+        return [field for field, _ in self._csv_spec()] + list(self._extra_fields())
 
 class BaseModelTypes(Enum):
     NONE = 0
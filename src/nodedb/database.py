@@ -1,20 +1,93 @@
 # database.py
 import re
+import csv
+import sys
+import pickle
+import bisect
 import difflib
 import warnings
-import jsonpickle
 
-from typing import Any, Optional, Callable
+from jsonpickle.pickler import Pickler
+from jsonpickle.unpickler import Unpickler
+from typing import Any, Optional, Callable, Iterable, TextIO
 from pathlib import Path
+from functools import lru_cache
+from operator import and_, attrgetter, or_
+from itertools import compress
 from uuid import UUID
 
 from .base_models import Node, Edge, BaseModel
-from .query import parse_expr, smart_tokenize
-from .jpickle_ex import deserialize_phase2, serialize_phase2
+from .query import compile_query, parse_query, query_fields
+from .jpickle_ex import deserialize_phase2, serialize_phase2, dump_json, loads_json
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # pragma: no cover
+    fuzz = process = None
+
+try:
+    # Only needed for RapidFuzz's multi-core `process.cdist`
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# Candidate count from which fuzzy scoring is spread across all cores
+PARALLEL_FUZZY_THRESHOLD = 50_000
+
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover
+    hyperscan = None
+
+# Repeated queries reuse their compiled patterns
+_compile_regex = lru_cache(maxsize=128)(re.compile)
+
+# Syntax Hyperscan accepts but reads differently from `re` (PCRE semantics):
+# `\Z` also matches before a final newline, and `{,n}` is a literal, not {0,n}
+_HYPERSCAN_DIFFERS = re.compile(r"\\Z|\{,\d*\}")
+
+@lru_cache(maxsize=32)
+def _hyperscan_database(patterns: tuple[str, ...]):
+    # UTF8 + UCP make "." match code points and \w, (?i) follow Unicode like `re`
+    flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[p.encode() for p in patterns],
+        ids=list(range(len(patterns))),
+        elements=len(patterns),
+        flags=[flags] * len(patterns),
+    )
+    return db
+
+def _remove_identical(items: list, item) -> bool:
+    """
+    Removes `item` itself from `items` (not just an equal object, as list.remove would:
+    models may define __eq__). Returns whether it was found.
+    """
+    for i, candidate in enumerate(items):
+        if candidate is item:
+            del items[i]
+            return True
+    return False
+
+_node_order = attrgetter("_order")
+
+def _insert_in_order(bucket: list[Node], node: Node) -> None:
+    # Appending keeps graph order for new nodes; reindexed ones go back to their position
+    if not bucket or bucket[-1]._order < node._order:
+        bucket.append(node)
+    else:
+        bisect.insort(bucket, node, key=_node_order)
 
 class Graph(BaseModel):
     nodes: list[Node]
     edges: list[Edge]
+
+    # Indexes and caches; `nodes`/`edges` backing slots are added by the metaclass
+    __slots__ = (
+        "__dict__", "_by_id", "_by_alias", "_by_name", "_sorted_ids",
+        "_choices_cache", "_columns", "_haystacks", "_next_order",
+    )
     
     # ─────────────────────────────────────────────
     # Initialization
@@ -23,130 +96,389 @@ class Graph(BaseModel):
     def __init__(self, *args, **kwargs):
         self.nodes: list[Node] = []
         self.edges: list[Edge] = []
+        self._rebuild_indexes()
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # Indexes are not serialized; rebuild them from the restored nodes
+        self._rebuild_indexes()
 
     # ─────────────────────────────────────────────
     # Node & Edge Management
     # ─────────────────────────────────────────────
 
     def add_node(self, node: Node):
+        """
+        Adds `node` to the graph. A node belongs to one graph at a time, since its
+        adjacency lists and index hooks live on the node itself: adding a node that
+        is still in another graph raises ValueError (call `remove_node` there first),
+        as does adding a node that is already in this graph.
+        """
+        if getattr(node, "_graph", None) is self:
+            raise ValueError(f"Node {node.name!r} is already in this graph")
+        self._check_owner(node)
+        node._order = self._next_order
+        self._next_order += 1
+        # Index first, so a node that can't be indexed never ends up in `nodes`
+        self._index_node(node)
         self.nodes.append(node)
 
     def add_edge(self, edge: Edge):
+        """Adds `edge`; raises ValueError if either endpoint belongs to another graph."""
+        self._check_owner(edge.node_a)
+        self._check_owner(edge.node_b)
         self.edges.append(edge)
+        self._link_edge(edge)
+
+    def _check_owner(self, node: Node):
+        owner = getattr(node, "_graph", None)
+        if owner is not None and owner is not self:
+            raise ValueError(f"Node {node.name!r} already belongs to another graph")
     
+    def remove_edge(self, edge: Edge):
+        # Raises ValueError (like list.remove) if the edge is not in the graph
+        if not _remove_identical(self.edges, edge):
+            raise ValueError("Edge is not in the graph")
+        self._unlink_edge(edge)
+
     def remove_node(self, node: Node):
-        # Remove edges connected to the node
-        self.edges = [e for e in self.edges if e.node_a != node and e.node_b != node]
-        
-        # Remove the node itself
-        self.nodes = [n for n in self.nodes if n != node]
+        self.remove_nodes([node])
+
+    def remove_nodes(self, nodes: Iterable[Node]):
+        """
+        Removes several nodes and their edges, rebuilding the node and edge lists once.
+        Nodes that are not in this graph are ignored.
+        """
+        targets = [n for n in nodes if getattr(n, "_graph", None) is self]
+        if not targets:
+            return
+        dead_nodes = {id(n) for n in targets}
+        dead_edges = set()
+
+        # Remove edges connected to the nodes, detaching them from their peers
+        for node in targets:
+            for edge in node._out_edges + node._in_edges:
+                dead_edges.add(id(edge))
+                self._unlink_edge(edge)
+        if dead_edges:
+            self.edges = [e for e in self.edges if id(e) not in dead_edges]
+
+        # Remove the nodes themselves
+        self.nodes = [n for n in self.nodes if id(n) not in dead_nodes]
+        for node in targets:
+            self._unindex_node(node)
+            node._graph = None
+
+    # ─────────────────────────────────────────────
+    # Node Indexes
+    # ─────────────────────────────────────────────
+
+    def _rebuild_indexes(self):
+        # Ids, aliases and names may collide, so each maps to a list in `self.nodes` order
+        self._by_id: dict[str, list[Node]] = {}
+        self._by_alias: dict[str, list[Node]] = {}
+        self._by_name: dict[str, list[Node]] = {}
+        self._choices_cache: dict[str, list[str]] = {}
+        self._columns: dict[str, list] = {}
+        self._haystacks: dict[str, tuple[str, list[int]]] = {}
+        # Sorted keys of `_by_id` for prefix search; None until first needed
+        self._sorted_ids: Optional[list[str]] = None
+        # Position keys used to keep index buckets and children in node order.
+        # Entries that aren't nodes (e.g. plain dicts left by a non-strict load
+        # of an unknown class) stay in the list but are not indexed
+        indexed = []
+        seen = set()
+        skipped = 0
+        for order, node in enumerate(self.nodes):
+            if not isinstance(node, Node):
+                skipped += 1
+                continue
+            if id(node) in seen:
+                continue  # listed twice; index it once, at its first position
+            seen.add(id(node))
+            node._reset_links()
+            node._order = order
+            indexed.append(node)
+        self._next_order = len(self.nodes)
+        for node in indexed:
+            self._index_node(node)
+        for edge in self.edges:
+            if isinstance(edge, Edge) and isinstance(edge.node_a, Node) and isinstance(edge.node_b, Node):
+                self._link_edge(edge)
+            else:
+                skipped += 1
+        if skipped:
+            warnings.warn(f"Skipped indexing {skipped} node/edge entries that are not Node/Edge instances")
+
+    def _invalidate_caches(self):
+        # Derived per-field views of the nodes; rebuilt lazily on next use
+        self._choices_cache.clear()
+        self._columns.clear()
+        self._haystacks.clear()
+
+    def _link_edge(self, edge: Edge):
+        edge.node_a._ensure_links()
+        edge.node_b._ensure_links()
+        edge.node_a._out_edges.append(edge)
+        edge.node_b._in_edges.append(edge)
+
+    def _unlink_edge(self, edge: Edge):
+        _remove_identical(edge.node_a._out_edges, edge)
+        _remove_identical(edge.node_b._in_edges, edge)
+
+    def _relink_edge(self, edge: Edge, attr: str, old: Node):
+        """Called by `Edge` when `node_a` or `node_b` is reassigned."""
+        adjacency = "_out_edges" if attr == "node_a" else "_in_edges"
+        if not _remove_identical(getattr(old, adjacency), edge):
+            return  # not linked, e.g. an edge that was never added
+        new = getattr(edge, attr)
+        if new is None:
+            return
+        owner = getattr(new, "_graph", None)
+        if owner is not None and owner is not self:
+            # Undo the assignment, like add_edge refusing the edge
+            getattr(old, adjacency).append(edge)
+            setattr(edge, f"_{attr}", old)
+            raise ValueError(f"Node {new.name!r} already belongs to another graph")
+        new._ensure_links()
+        getattr(new, adjacency).append(edge)
+
+    def _index_node(self, node: Node, fields=("id", "alias", "name", "parent")):
+        self._invalidate_caches()
+        node._ensure_links()
+        if "parent" in fields and node.parent is not None:
+            node.parent._ensure_links()
+            _insert_in_order(node.parent._children, node)
+        if "id" in fields:
+            node_id = getattr(node, "_id_str", None)
+            if node_id is None:
+                # Never assigned through the `id` setter (e.g. Node.__init__ was skipped)
+                node_id = node._id_str = sys.intern(str(node.id))
+            bucket = self._by_id.get(node_id)
+            if bucket is None:
+                self._by_id[node_id] = [node]
+                # Re-sorted lazily by `match_closest_node_id`, so bulk inserts stay linear
+                self._sorted_ids = None
+            else:
+                _insert_in_order(bucket, node)
+        if "alias" in fields:
+            _insert_in_order(self._by_alias.setdefault(node.alias, []), node)
+        if "name" in fields:
+            _insert_in_order(self._by_name.setdefault(node.name, []), node)
+        node._graph = self
+
+    def _unindex_node(self, node: Node, keys: Optional[dict[str, Any]] = None):
+        # `keys` maps field -> indexed value; defaults to the node's current values
+        self._invalidate_caches()
+        if keys is None:
+            keys = {"id": node._id_str, "alias": node.alias, "name": node.name, "parent": node.parent}
+        parent = keys.get("parent")
+        if parent is not None:
+            _remove_identical(parent._children, node)
+        if "id" in keys:
+            node_id = str(keys["id"])
+            bucket = self._by_id.get(node_id)
+            if bucket and _remove_identical(bucket, node):
+                if not bucket:
+                    # Last node with this id; other nodes sharing it keep the key alive
+                    del self._by_id[node_id]
+                    sorted_ids = self._sorted_ids
+                    if sorted_ids is not None:
+                        i = bisect.bisect_left(sorted_ids, node_id)
+                        if i < len(sorted_ids) and sorted_ids[i] == node_id:
+                            del sorted_ids[i]
+        for field, index in (("alias", self._by_alias), ("name", self._by_name)):
+            if field not in keys:
+                continue
+            bucket = index.get(keys[field])
+            if bucket and _remove_identical(bucket, node) and not bucket:
+                del index[keys[field]]
+
+    def _reindex_node(self, node: Node, attr: str, old: Any):
+        """Called by `Node` when one of its indexed fields is reassigned."""
+        self._unindex_node(node, {attr: old})
+        self._index_node(node, fields=(attr,))
 
     # ─────────────────────────────────────────────
     # Lookup by Identity
     # ─────────────────────────────────────────────
 
     def get_node_by_id(self, node_id: str | UUID) -> Optional[Node]:
-        node_id = str(node_id)
-        for node in self.nodes:
-            if str(node.id) == node_id:
-                return node
-        return None
+        # Keyed by the canonical id string (str hashes are cached, UUID hashes are not)
+        if not isinstance(node_id, str):
+            node_id = str(node_id)
+        nodes = self._by_id.get(node_id)
+        if nodes is None:
+            # Accept any spelling UUID() does (upper case, no hyphens, urn:uuid:)
+            try:
+                nodes = self._by_id.get(str(UUID(node_id)))
+            except ValueError:
+                pass
+        return nodes[0] if nodes else None
     
     def get_node_by_alias(self, node_alias: str) -> Optional[Node]:
-        for node in self.nodes:
-            if str(node.alias) == node_alias:
-                return node
-        return None
+        nodes = self._by_alias.get(node_alias)
+        return nodes[0] if nodes else None
     
     def get_node_by_name(self, node_name: str) -> Optional[Node]:
-        for node in self.nodes:
-            if node_name == node.name:
-                return node
-        return None
+        nodes = self._by_name.get(node_name)
+        return nodes[0] if nodes else None
     
     # ─────────────────────────────────────────────
     # Fuzzy / Closest Matching
     # ─────────────────────────────────────────────
     
     def get_closest_nodes_alias(self, alias: str) -> Optional[Node]:
-        possible_nodes = []
-        for node in self.nodes:
-            if alias in node.alias:
-                possible_nodes.append(node)
-            if alias == node.alias:
-                return node
-        return possible_nodes
+        exact = self.get_node_by_alias(alias)
+        if exact is not None:
+            return exact
+        return self._nodes_containing("alias", alias)
     
     def match_closest_node_alias(self, alias: str, match_cutoff: float = 0.7) -> Optional[Node]:
-        possible_node = self.get_closest_nodes_alias(alias)
-        if isinstance(possible_node, Node):
-            if possible_node.alias == alias:
-                return possible_node
-    
-        best_match = None
-        highest_similarity = 0
-        
-        for node in self.nodes:
-            similarity = difflib.SequenceMatcher(None, alias, node.alias).ratio()
-            if similarity > highest_similarity:
-                highest_similarity = similarity
-                best_match = node
-
-        if highest_similarity >= match_cutoff:
-            return best_match
-        else:
-            return None
+        exact = self.get_node_by_alias(alias)
+        if exact is not None:
+            return exact
+        return self._best_fuzzy(alias, "alias", match_cutoff)
     
     def get_closest_nodes_name(self, node_name: str) -> Optional[Node]:
-        possible_nodes = []
-        for node in self.nodes:
-            if node_name in node.name:
-                possible_nodes.append(node)
-            if node_name == node.name:
-                return node
-        return possible_nodes
+        exact = self.get_node_by_name(node_name)
+        if exact is not None:
+            return exact
+        return self._nodes_containing("name", node_name)
         
     def match_closest_node_name(self, node_name: str, match_cutoff: float = 0.7) -> Optional[Node]:
         # First check for exact match
-        for node in self.nodes:
-            if node_name == node.name:
-                return node
+        exact = self.get_node_by_name(node_name)
+        if exact is not None:
+            return exact
 
         # Otherwise, find the node with the highest similarity
-        best_match = None
-        highest_similarity = 0
-
-        for node in self.nodes:
-            similarity = difflib.SequenceMatcher(None, node_name, node.name).ratio()
-            if similarity > highest_similarity:
-                highest_similarity = similarity
-                best_match = node
-
-        if highest_similarity >= match_cutoff:
-            return best_match
-        else:
-            return None
+        return self._best_fuzzy(node_name, "name", match_cutoff)
 
     def match_closest_node_id(self, node_id: str, match_cutoff: float = 0.7) -> Optional[Node]:
         # Exact match
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
-
-        # Prefix match
-        prefix_matches = [node for node in self.nodes if node.id.startswith(node_id)]
-        if prefix_matches:
+        exact = self.get_node_by_id(node_id)
+        if exact is not None:
+            return exact
+
+        # Prefix match; ids sharing the prefix sit contiguously in the sorted list
+        sorted_ids = self._sorted_ids
+        if sorted_ids is None:
+            sorted_ids = self._sorted_ids = sorted(self._by_id)
+        i = bisect.bisect_left(sorted_ids, node_id)
+        best_id = None
+        while i < len(sorted_ids) and sorted_ids[i].startswith(node_id):
             # If multiple, return shortest match
-            return min(prefix_matches, key=lambda n: len(n.id))
+            if best_id is None or len(sorted_ids[i]) < len(best_id):
+                best_id = sorted_ids[i]
+            i += 1
+        if best_id is not None:
+            return self._by_id[best_id][0]
+
+        # Fuzzy fallback
+        return self._best_fuzzy(node_id, "id", match_cutoff)
+
+    def _fuzzy_choices(self, field: str) -> list[str]:
+        # Cached per field, in node order; dropped whenever the indexes change
+        choices = self._choices_cache.get(field)
+        if choices is None:
+            key = "_id_str" if field == "id" else field
+            choices = self._choices_cache[field] = [str(getattr(n, key)) for n in self.nodes]
+        return choices
+
+    def _column(self, field: str) -> list:
+        """
+        Values of `field` for every node, in node order.
+        Watched fields report their changes, so only their columns are cached.
+        """
+        column = self._columns.get(field)
+        if column is None:
+            column = list(map(attrgetter(field), self.nodes))
+            if field in Node.__watched_fields__:
+                self._columns[field] = column
+        return column
+
+    def _nodes_containing(self, field: str, query: str) -> list[Node]:
+        """
+        Nodes (in order) whose `field` contains `query`. All values are joined into one
+        NUL-separated haystack, so the search is a handful of C-level str.find calls
+        rather than a Python-level `in` test per node.
+        """
+        if not query:
+            return list(self.nodes)
+        if "\0" in query:
+            # Could straddle the separator; take the plain route
+            return [n for n, v in zip(self.nodes, self._fuzzy_choices(field)) if query in v]
+
+        cached = self._haystacks.get(field)
+        if cached is None:
+            choices = self._fuzzy_choices(field)
+            starts, offset = [], 0
+            for value in choices:
+                starts.append(offset)
+                offset += len(value) + 1
+            cached = self._haystacks[field] = ("\0".join(choices), starts)
+        haystack, starts = cached
+
+        matches = []
+        pos = haystack.find(query)
+        while pos != -1:
+            i = bisect.bisect_right(starts, pos) - 1
+            matches.append(self.nodes[i])
+            # Resume at the next value so each node is reported once
+            if i + 1 >= len(starts):
+                break
+            pos = haystack.find(query, starts[i + 1])
+        return matches
+
+    def _best_fuzzy(self, query: str, field: str, match_cutoff: float) -> Optional[Node]:
+        """
+        Returns the node whose `field` is most similar to `query`,
+        or None if nothing reaches `match_cutoff`.
+        Uses RapidFuzz when installed, otherwise a single difflib pass.
+        """
+        choices = self._fuzzy_choices(field)
+
+        if process is not None:
+            score_cutoff = match_cutoff * 100
+            if numpy is not None and len(choices) >= PARALLEL_FUZZY_THRESHOLD:
+                # Scores below the cutoff come back as 0
+                scores = process.cdist(
+                    [query], choices, scorer=fuzz.ratio, score_cutoff=score_cutoff, workers=-1
+                )[0]
+                best = int(scores.argmax())
+                return self.nodes[best] if scores[best] >= score_cutoff else None
+
+            result = process.extractOne(
+                query, choices, scorer=fuzz.ratio, score_cutoff=score_cutoff
+            )
+            return self.nodes[result[2]] if result else None
 
-        # Fuzzy fallback (optional, or skip)
         best_match = None
         highest_similarity = 0
-        for node in self.nodes:
-            similarity = difflib.SequenceMatcher(None, node_id, node.id).ratio()
+
+        # Same orientation as SequenceMatcher(None, query, candidate): ratio() is not
+        # symmetric, so the query stays seq1 and each candidate is swapped in as seq2.
+        # The autojunk heuristic only applies to 200+ char strings, where it skews
+        # ratios, so leave it off.
+        matcher = difflib.SequenceMatcher(autojunk=False)
+        matcher.set_seq1(query)
+        floor = match_cutoff
+
+        for node, candidate in zip(self.nodes, choices):
+            if candidate == query:
+                return node
+
+            # Cheap upper bounds first (same trick as difflib.get_close_matches)
+            matcher.set_seq2(candidate)
+            if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+                continue
+
+            similarity = matcher.ratio()
             if similarity > highest_similarity:
                 highest_similarity = similarity
                 best_match = node
+                floor = max(floor, similarity)
 
         if highest_similarity >= match_cutoff:
             return best_match
@@ -162,82 +494,124 @@ class Graph(BaseModel):
         return node.parent if node else None
 
     def get_children(self, parent_node: Node) -> list[Node]:
-        return [n for n in self.nodes if n.parent == parent_node]
+        return list(parent_node._children)
     
     def get_edges_from(self, node: Node) -> list[Edge]:
-        return [e for e in self.edges if e.node_a == node]
+        return list(node._out_edges)
 
     def get_edges_to(self, node: Node) -> list[Edge]:
-        return [e for e in self.edges if e.node_b == node]
+        return list(node._in_edges)
 
 
     # ─────────────────────────────────────────────
     # Filtering / Querying
     # ─────────────────────────────────────────────
 
-    def filter_nodes_by_field(self, field: str, value: Any) -> list[Node]:
-        if not all(hasattr(n, field) for n in self.nodes):
+    def _check_field(self, field: str) -> None:
+        # Annotated Node fields exist on every node (as properties), so only
+        # other names (e.g. subclass fields) need the per-node scan
+        if field in Node._merged_annotations():
+            return
+        # Nodes share a schema, so the first one stands in for the rest; a node
+        # that still lacks the field fails while its column is built
+        if self.nodes and not hasattr(self.nodes[0], field):
             raise AttributeError(f"Field '{field}' not found in Node")
-        return [n for n in self.nodes if getattr(n, field, None) == value]
+
+    def filter_nodes_by_field(self, field: str, value: Any) -> list[Node]:
+        self._check_field(field)
+        return [n for n, v in zip(self.nodes, self._column(field)) if v == value]
 
     def find_nodes(self, fn: Callable[['Node'], bool]) -> tuple[list[list], list[str]]:
         return [n for n in self.nodes if fn(n)]
 
     def find_nodes_by_regex(self, field: str, pattern: str) -> tuple[list[list], list[str]]:
-        regex = re.compile(pattern)
+        regex = _compile_regex(pattern)
         return [n for n in self.nodes if regex.search(str(getattr(n, field, "")))]
 
-    def find_nodes_by_query(self, query: str) -> list[Node]:
-        tokens = smart_tokenize(query)
-        ast, i = parse_expr(tokens)
-        if i != len(tokens):
-            raise SyntaxError(f"Unexpected trailing tokens: {tokens[i:]}")
-        return [n for n in self.nodes if self._evaluate_ast(ast, n)]
-
-    def _evaluate_ast(self, ast, node) -> bool:
-        if isinstance(ast, tuple):
-            tag = ast[0]
-
-            if tag == 'MATCH':
-                field, op, pattern = ast[1], ast[2], ast[3]
-                value = getattr(node, field, None)
-                if value is None:
-                    return False
-                value = str(value)
-
-                try:
-                    if op == '=':
-                        return re.search(pattern, value) is not None
-                    elif op == '!=':
-                        return re.search(pattern, value) is None
-                    else:
-                        raise ValueError(f"Unknown operator: {op}")
-                except re.error as e:
-                    raise ValueError(f"Invalid regex: {pattern!r} ({e})")
-
-            elif tag == 'or':
-                left = self._evaluate_ast(ast[1], node)
-                right = self._evaluate_ast(ast[2], node)
-                return left or right
-
-            elif tag == 'and':
-                left = self._evaluate_ast(ast[1], node)
-                right = self._evaluate_ast(ast[2], node)
-                return left and right
-
-        return False
+    def find_nodes_by_regex_multi(self, field: str, patterns: list[str]) -> list[Node]:
+        """
+        Returns the nodes whose `field` matches any of `patterns`.
+        With Hyperscan installed all patterns are matched in one scan per node;
+        otherwise (or if Hyperscan rejects a pattern) falls back to `re`.
+        """
+        patterns = tuple(patterns)
+        if not patterns:
+            return []
+
+        if hyperscan is not None and not any(_HYPERSCAN_DIFFERS.search(p) for p in patterns):
+            try:
+                db = _hyperscan_database(patterns)
+            except hyperscan.error:
+                # e.g. backreferences or lookarounds, which Hyperscan doesn't support
+                db = None
+            if db is not None:
+                def on_match(pattern_id, start, end, flags, context):
+                    context.append(pattern_id)
+
+                regexes = None
+                matched = []
+                hits = []
+                for n in self.nodes:
+                    value = str(getattr(n, field, ""))
+                    try:
+                        data = value.encode()
+                    except UnicodeEncodeError:
+                        # Lone surrogates aren't valid UTF-8 input for Hyperscan; use `re`
+                        if regexes is None:
+                            regexes = [_compile_regex(p) for p in patterns]
+                        if any(r.search(value) for r in regexes):
+                            matched.append(n)
+                        continue
+                    db.scan(data, match_event_handler=on_match, context=hits)
+                    if hits:
+                        matched.append(n)
+                        hits.clear()
+                return matched
+
+        regexes = [_compile_regex(p) for p in patterns]
+        matched = []
+        for n in self.nodes:
+            value = str(getattr(n, field, ""))
+            if any(r.search(value) for r in regexes):
+                matched.append(n)
+        return matched
 
+    def find_nodes_by_query(self, query: str) -> list[Node]:
+        predicate = compile_query(query)  # also validates operators and patterns
+        ast = parse_query(query)
+        if query_fields(ast) <= set(Node.__watched_fields__):
+            # Indexed fields have cached columns; evaluate the query a column at a time
+            return list(compress(self.nodes, self._query_mask(ast)))
+        return [n for n in self.nodes if predicate(n)]
+
+    def _query_mask(self, ast) -> list[bool]:
+        """One bool per node (in node order) for whether it satisfies `ast`."""
+        if not isinstance(ast, tuple):
+            return [False] * len(self.nodes)
+        tag = ast[0]
+        if tag == 'MATCH':
+            field, op, pattern = ast[1], ast[2], ast[3]
+            search = _compile_regex(pattern).search
+            column = self._column(field)
+            if op == '=':
+                return [v is not None and search(str(v)) is not None for v in column]
+            return [v is not None and search(str(v)) is None for v in column]
+        if tag == 'and':
+            return list(map(and_, self._query_mask(ast[1]), self._query_mask(ast[2])))
+        if tag == 'or':
+            return list(map(or_, self._query_mask(ast[1]), self._query_mask(ast[2])))
+        return [False] * len(self.nodes)
 
     def sort_nodes_by(
         self, field: str, limit: int = None, offset: int = 0
     ) -> tuple[list[list], list[str]]:
-        if not all(hasattr(n, field) for n in self.nodes):
-            raise AttributeError(f"Field '{field}' not found in Node")
+        self._check_field(field)
 
-        sorted_nodes = sorted(self.nodes, key=lambda n: getattr(n, field, ""))
-        paged_nodes = sorted_nodes[offset: offset + limit if limit is not None else None]
+        column = self._column(field)
+        order = sorted(range(len(column)), key=column.__getitem__)
+        paged = order[offset: offset + limit if limit is not None else None]
 
-        return paged_nodes
+        return [self.nodes[i] for i in paged]
 
     # ─────────────────────────────────────────────
     # Exporting / Serialization
@@ -253,18 +627,25 @@ class Graph(BaseModel):
     def csv_nodes(self) -> tuple[list[list], list[str]]:
         return self._nodes_to_csv(self.nodes)
 
-    def save(self, filepath: str | Path, raise_empty_nodes_error=False) -> None:
-        from json import loads, dumps
-
-        if all(isinstance(x, dict) and not x for x in self.nodes):
-            msg = "Node data is likely malformed as the nodes list contains only empty dicts."
-            if raise_empty_nodes_error:
-                raise(msg)
+    def write_csv(self, fileobj: TextIO) -> None:
+        """
+        Streams the nodes as CSV (header row first) into a text file object,
+        without materializing the full row list like `csv_nodes` does.
+        Open files with `newline=""` as the csv module expects.
+        """
+        if not self.nodes:
+            return
+        writer = csv.writer(fileobj)
+        writer.writerow(self.nodes[0].csv_headers())
+        writer.writerows(n.as_csv() for n in self.nodes)
 
-        # Clean node data
-        for i in reversed(range(len(self.nodes))):
-            if self.nodes[i] == {}:
-                del self.nodes[i]
+    def save(self, filepath: str | Path, raise_empty_nodes_error=False) -> None:
+        # Clean node data (drop empty dicts) in a single pass
+        nonempty = [n for n in self.nodes if not (isinstance(n, dict) and not n)]
+        if not nonempty and self.nodes and raise_empty_nodes_error:
+            raise ValueError("Node data is likely malformed as the nodes list contains only empty dicts.")
+        if len(nonempty) != len(self.nodes):
+            self.nodes = nonempty
 
         filepath = Path(filepath)
 
@@ -275,42 +656,62 @@ class Graph(BaseModel):
         # Ensure parent directories exist
         filepath.parent.mkdir(parents=True, exist_ok=True)
 
-        # Encode graph -> JSON string with refs
-        raw_json_str = jsonpickle.encode(self, make_refs=True)
+        # Flatten graph -> JSON-ready dict with refs (no intermediate string)
+        data_dict = Pickler(make_refs=True).flatten(self)
 
         # Defensive check
-        if not raw_json_str or raw_json_str.strip() == "{}":
+        if not data_dict:
             raise ValueError("Refusing to save empty or malformed graph data")
 
-        # Convert to dict for phase2 transform
-        data_dict = loads(raw_json_str)
-        transformed_data = serialize_phase2(data_dict)
+        non_finite = []
+        transformed_data = serialize_phase2(data_dict, non_finite=non_finite)
 
-        # Write final JSON string to file
-        filepath.write_text(dumps(transformed_data, indent=2))
+        # Encode before touching the file; orjson would turn NaN/inf into null
+        dump_json(transformed_data, filepath, indent=True, use_orjson=not non_finite)
     
     @staticmethod
     def load(filepath: Path, type_overrides: dict[str, str] = {}) -> 'Graph':
-        from json import loads, dumps
-
         if isinstance(filepath, str):
             filepath = Path(filepath)
 
         # Read file as JSON dict
-        raw_data = loads(filepath.read_text())
+        raw_data = loads_json(filepath.read_bytes())
 
         if "REGISTRY" in raw_data:
             # Reverse the phase2 transformation
             deserialized_data = deserialize_phase2(raw_data, type_overrides=type_overrides)
-            obj = jsonpickle.decode(dumps(deserialized_data), keys=True)
         else:
             # Try to convert legacy structure to 2-phase
             serialized = serialize_phase2(raw_data)
             deserialized_data = deserialize_phase2(serialized, type_overrides=type_overrides)
-            obj = jsonpickle.decode(dumps(deserialized_data), keys=True)
+
+        # Restore straight from the dict; no re-encode/decode round trip
+        obj = Unpickler(keys=True).restore(deserialized_data)
         
         return obj
     
+    def save_binary(self, filepath: str | Path) -> None:
+        """
+        Writes a pickle snapshot of the graph (highest protocol, 5 on 3.8+).
+        Much faster and smaller than `save`, but Python-only: classes must be importable
+        under the same paths on load (no REGISTRY / type_overrides remapping), and
+        like any pickle it must never be loaded from an untrusted source.
+        Use `save` for files meant to be read by people or other tools.
+        """
+        filepath = Path(filepath)
+
+        # Prevent writing to a directory
+        if filepath.exists() and filepath.is_dir():
+            raise ValueError(f"Refusing to save to directory: {filepath}")
+
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        filepath.write_bytes(pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def load_binary(filepath: str | Path) -> 'Graph':
+        """Loads a snapshot written by `save_binary`."""
+        return pickle.loads(Path(filepath).read_bytes())
+
     # ─────────────────────────────────────────────
     # Debug / Introspection
     # ─────────────────────────────────────────────
@@ -319,15 +720,17 @@ class Graph(BaseModel):
         return {
             "total_nodes": len(self.nodes),
             "total_edges": len(self.edges),
-            "isolated_nodes": len([n for n in self.nodes if not self.get_edges_from(n) and not self.get_edges_to(n)])
+            "isolated_nodes": sum(1 for n in self.nodes if not n._out_edges and not n._in_edges)
         }
     
     def print_graph(self) -> None:
         """MOSTLY FOR DEBUG PURPOSES"""
-        print("Graph Nodes:")
-        for node in self.nodes:
-            print(f"  - {node.name} ({node.alias}) [{node.id}]")
-
-        print("\nGraph Edges:")
-        for edge in self.edges:
-            print(f"  - {edge.node_a.alias} --[{edge.name}]--> {edge.node_b.alias}")
+        # Built up front and written once rather than one print() per line
+        lines = ["Graph Nodes:"]
+        lines.extend(f"  - {node.name} ({node.alias}) [{node.id}]" for node in self.nodes)
+
+        lines.append("\nGraph Edges:")
+        lines.extend(
+            f"  - {edge.node_a.alias} --[{edge.name}]--> {edge.node_b.alias}" for edge in self.edges
+        )
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -1,25 +1,146 @@
-from uuid import uuid4
+import os
+import sys
+import json
+import importlib
+from itertools import count
+from functools import lru_cache
+from weakref import WeakKeyDictionary
 from typing import Optional
+from pathlib import Path
 from difflib import get_close_matches
 
 import warnings
 
+import jsonpickle.handlers
+from jsonpickle import tags
+from jsonpickle.unpickler import loadclass, _Proxy
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 from .utils import (
-    recurse_json, 
     get_all_classes_from_loaded_modules,
     get_all_classes_from_specific_loaded_module,
     get_all_subclasses_of,
+    loaded_classes_version,
     validate_type_overrides
     )
 from .base_models import Node, Edge, BaseModel, BaseModelTypes
 
-def fuzzy_type_match(type_path: str, known_types: dict[str, type]) -> Optional[str]:
-    close = get_close_matches(type_path, known_types.keys(), n=1, cutoff=0.7)
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+class BaseModelHandler(jsonpickle.handlers.BaseHandler):
+    """
+    Writes a model's annotated fields straight into its jsonpickle dict instead of
+    building a __getstate__ dict and flattening it as a nested "py/state".
+    Primitive fields skip the pickler entirely; everything else (ids, enums, other nodes)
+    still goes through it so shared references keep their "py/id" tags.
+    """
+    def flatten(self, obj, data):
+        if type(obj).__getstate__ is not BaseModel.__getstate__:
+            # Custom state; keep the regular layout
+            data[tags.STATE] = self.context.flatten(obj.__getstate__(), reset=False)
+            return data
+
+        for field in obj._merged_annotations():
+            value = getattr(obj, field, None)
+            if type(value) in _PRIMITIVES:
+                data[field] = value
+            else:
+                data[field] = self.context.flatten(value, reset=False)
+        return data
+
+    def restore(self, data):
+        cls = loadclass(data[tags.OBJECT])
+        instance = cls.__new__(cls)
+
+        # jsonpickle registers a placeholder for us right before calling restore();
+        # point it at the real instance (as its default path does) so cyclic
+        # "py/id" references made while restoring our state resolve to this object
+        refs = self.context._objs
+        if refs and isinstance(refs[-1], _Proxy):
+            refs[-1] = instance
+
+        if tags.STATE in data:
+            # Files written before this handler existed, or models with custom state
+            state = self.context.restore(data[tags.STATE], reset=False)
+        else:
+            state = {}
+            for field, value in data.items():
+                if field == tags.OBJECT:
+                    continue
+                if isinstance(value, (dict, list)):
+                    value = self.context.restore(value, reset=False)
+                state[field] = value
+        instance.__setstate__(state)
+        return instance
+
+jsonpickle.handlers.register(Node, BaseModelHandler, base=True)
+jsonpickle.handlers.register(Edge, BaseModelHandler, base=True)
+
+def dump_json(data, filepath: Path, indent: bool = False, use_orjson: bool = True) -> None:
+    """
+    Write `data` as UTF-8 JSON to `filepath`, leaving an existing file untouched if encoding fails.
+    orjson output is encoded in full before the file is opened; the stdlib fallback
+    streams chunks to a temporary file next to it, which then replaces the target.
+    orjson writes NaN and infinities as null, so pass `use_orjson=False`
+    for documents holding them; the stdlib keeps them as NaN/Infinity.
+    Falls back to the stdlib for anything orjson refuses (e.g. ints wider than 64 bits).
+    """
+    if orjson is not None and use_orjson:
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            pass
+        else:
+            filepath.write_bytes(payload)
+            return
+    tmp = filepath.with_name(f".{filepath.name}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2 if indent else None)
+        os.replace(tmp, filepath)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def loads_json(raw: bytes | str):
+    """Decode JSON text or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            # orjson is strict about non-standard tokens such as NaN
+            pass
+    return json.loads(raw)
+
+def fuzzy_type_match(type_path: str, known_types: dict[str, type], cutoff: float = 0.7) -> Optional[str]:
+    # Drop candidates whose length alone caps their ratio below the cutoff; this is the
+    # bound get_close_matches checks first (real_quick_ratio), so the result is the same
+    n = len(type_path)
+    candidates = [
+        path for path in known_types
+        if 2.0 * min(n, len(path)) / ((n + len(path)) or 1) >= cutoff
+    ]
+    close = get_close_matches(type_path, candidates, n=1, cutoff=cutoff)
     return close[0] if close else None
 
+@lru_cache(maxsize=8)
+def _subclasses_of(base_model: type[BaseModel], classes_version: int) -> dict[str, type]:
+    # `classes_version` only keys the cache: newly scanned modules rebuild the map.
+    # Old versions are never asked for again, so only a few base models' maps are kept
+    return get_all_subclasses_of(base_model)
+
 def find_type_fallback(type_path: str, base_model: type[BaseModel]) -> Optional[str]:
+    return _find_type_fallback(type_path, base_model, loaded_classes_version())
+
+@lru_cache(maxsize=1024)
+def _find_type_fallback(type_path: str, base_model: type[BaseModel], classes_version: int) -> Optional[str]:
+    # `classes_version` only keys the cache, so newly imported classes get a fresh search
     # First use the base model to see if anything that extends that type has a close name
-    inherited_classes = get_all_subclasses_of(base_model)
+    inherited_classes = _subclasses_of(base_model, classes_version)
     interited_attempt = fuzzy_type_match(type_path, inherited_classes)
     
     if interited_attempt:
@@ -36,11 +157,19 @@ def find_type_fallback(type_path: str, base_model: type[BaseModel]) -> Optional[
     return None
 
 def resolve_class_type(import_path: str) -> Optional[type]:
-    import importlib
+    if not isinstance(import_path, str):
+        # Only import paths are worth (and able to be) cached
+        return _resolve_class_type.__wrapped__(import_path)
+    return _resolve_class_type(import_path)
 
+@lru_cache(maxsize=4096)
+def _resolve_class_type(import_path: str) -> Optional[type]:
     try:
         module_path, _, class_name = import_path.rpartition(".")
-        module = importlib.import_module(module_path)
+        # Already-imported modules skip the import lock and finder walk
+        module = sys.modules.get(module_path)
+        if module is None:
+            module = importlib.import_module(module_path)
         return getattr(module, class_name)
     except Exception:
         # Fallback: try fuzzy match based on BaseModel subclasses
@@ -62,86 +191,133 @@ def deserialize_phase2(
     validate_type_overrides(type_overrides=type_overrides, strict=strict_typeoverrides)
     
     registry = data.pop("REGISTRY", {})
+    possible_classes = get_all_classes_from_loaded_modules()
+
+    # Resolve every registry entry once up front; the walk below is then a dict lookup per tag
+    resolved: dict[str, str] = {}
+    for uid, entry in registry.items():
+        if not uid.startswith("EXTRACT_"):
+            continue
+        if isinstance(entry, dict):
+            # Files written before registry entries became [path, base] pairs
+            obj_path, base_model_key = entry["path"], entry["base"]
+        else:
+            obj_path, base_model_key = entry
+        base_model = BaseModelTypes.get_type(base_model_key)
+        if obj_path in type_overrides:
+            obj_path = type_overrides.get(obj_path, obj_path)
+        elif obj_path not in possible_classes:
+            attempt = find_type_fallback(obj_path, base_model=base_model)
+            fuzzy_fail_msg =  f"The object `{obj_path}` could not be found.\n" \
+                    "Fuzzy matching could also not find a replace that was similar enough."
+            if attempt:
+                warnings.warn(f"Fuzzy matched `{obj_path}` to `{attempt}`")
+                obj_path = attempt
+            else:
+                if strict_class_resolve:
+                    raise ValueError(fuzzy_fail_msg)
+                else:
+                    warnings.warn(fuzzy_fail_msg)
+        resolved[uid] = obj_path
+
+    # Iterative in-place walk; deep graphs never hit the recursion limit
+    stack = [data]
+    while stack:
+        d = stack.pop()
+        if isinstance(d, list):
+            stack.extend(d)
+            continue
+        if not isinstance(d, dict):
+            continue
 
-    def callback(d: dict):
-        pickle_type = None
-        
-        if "py/object" in d:
-            pickle_type = "py/object"
-        elif "py/type" in d:
+        pickle_type = "py/object"
+        uid = d.get(pickle_type)
+        if uid is None:
             pickle_type = "py/type"
-        if pickle_type:
-            uid = d[pickle_type]
-            if isinstance(uid, str) and uid.startswith("EXTRACT_") and uid in registry:
-                obj_path = registry[uid]["path"]
-                base_model_key = registry[uid]["base"]
-                base_model = BaseModelTypes.get_type(base_model_key)
-                possible_classes = get_all_classes_from_loaded_modules()
-                if obj_path in type_overrides:
-                    obj_path = type_overrides.get(obj_path, obj_path)
-                elif obj_path not in possible_classes.keys():
-                    attempt = find_type_fallback(obj_path, base_model=base_model)
-                    fuzzy_fail_msg =  f"The object `{obj_path}` could not be found.\n" \
-                            "Fuzzy matching could also not find a replace that was similar enough."
-                    if attempt:
-                        warnings.warn(f"Fuzzy matched `{obj_path}` to `{attempt}`")
-                        obj_path = attempt
-                    else:
-                        if strict_class_resolve:
-                            raise ValueError(fuzzy_fail_msg)
-                        else:
-                            warnings.warn(fuzzy_fail_msg)
+            uid = d.get(pickle_type)
+        if isinstance(uid, str):
+            obj_path = resolved.get(uid)
+            if obj_path is not None:
                 d[pickle_type] = obj_path
-        return d
+        stack.extend(d.values())
+
+    return data
+
+# Model type per class; weak keys so classes that go away don't linger
+_model_type_cache: "WeakKeyDictionary[type, BaseModelTypes]" = WeakKeyDictionary()
+
+def _classify(cls: type) -> BaseModelTypes:
+    model_type = _model_type_cache.get(cls)
+    if model_type is not None:
+        return model_type
 
-    return recurse_json(data, callback)
+    if issubclass(cls, Node):
+        model_type = BaseModelTypes.NODE
+    elif issubclass(cls, Edge):
+        model_type = BaseModelTypes.EDGE
+    elif issubclass(cls, BaseModel):
+        model_type = BaseModelTypes.BASEMODEL
+    else:
+        model_type = BaseModelTypes.NODE  # default fallback
+    _model_type_cache[cls] = model_type
+    return model_type
 
-def serialize_phase2(data):
+def clear_class_resolve_caches() -> None:
+    """Forget every cached path -> class resolution (e.g. after classes are redefined or reloaded)."""
+    _resolve_class_type.cache_clear()
+    _subclasses_of.cache_clear()
+    _find_type_fallback.cache_clear()
+
+def serialize_phase2(data, non_finite: Optional[list] = None):
     """
-    Replace all "py/object" and "py/type" strings with unique UUID tags, storing original values in a registry.
-    Returns (transformed_data, registry)
+    Replace all "py/object" and "py/type" strings with unique "EXTRACT_<n>" tags, storing original values in a registry.
+    Modifies `data` in-place and returns it with the "REGISTRY" entry added.
+    If `non_finite` is given, every NaN or infinite float met on the way is appended to it.
     """
 
-    registry = {}        # maps UUID -> original "py/object" path
-    reverse = {}         # maps "py/object" path -> UUID (for deduplication)
+    registry = {}        # maps tag -> (original "py/object" path, BaseModelTypes name)
+    reverse = {}         # maps "py/object" path -> tag (for deduplication)
+    by_cls = {}          # maps resolved class -> tag (collapses aliased paths)
+    counter = count()    # tags only need to be unique within one document
+
+    # Same iterative in-place walk as `deserialize_phase2`
+    stack = [data]
+    while stack:
+        d = stack.pop()
+        if isinstance(d, list):
+            stack.extend(d)
+            continue
+        if not isinstance(d, dict):
+            # x - x is 0.0 for every finite float and NaN otherwise
+            if non_finite is not None and isinstance(d, float) and d - d != 0.0:
+                non_finite.append(d)
+            continue
 
-    def callback(d: dict):
-        pickle_type = None
-        
-        if "py/object" in d:
-            pickle_type = "py/object"
-        elif "py/type" in d:
+        pickle_type = "py/object"
+        original = d.get(pickle_type)
+        if original is None:
             pickle_type = "py/type"
-        if pickle_type:
-            original = d[pickle_type]
+            original = d.get(pickle_type)
+        if original is not None:
             if original in reverse:
-                uid = reverse[original]
-                d[pickle_type] = uid
-                return d
-
-            cls = resolve_class_type(original)
-            model_type = None
-
-            if cls:
-                if issubclass(cls, Node):
-                    model_type = BaseModelTypes.NODE
-                elif issubclass(cls, Edge):
-                    model_type = BaseModelTypes.EDGE
-                elif issubclass(cls, BaseModel):
-                    model_type = BaseModelTypes.BASEMODEL
-                else:
-                    model_type = BaseModelTypes.NODE  # default fallback
+                d[pickle_type] = reverse[original]
             else:
-                warnings.warn(f"Could not resolve class for: {original}")
-                model_type = BaseModelTypes.NODE  # fallback to something safe
-
-            uid = "EXTRACT_" + str(uuid4())
-            reverse[original] = uid
-            registry[uid] = {"path": original, "base": model_type.name}
-            d[pickle_type] = uid
-
-        return d
+                # Paths that resolve to the same class share one registry entry
+                cls = resolve_class_type(original)
+                uid = by_cls.get(cls) if cls is not None else None
+                if uid is None:
+                    if cls:
+                        model_type = _classify(cls)
+                    else:
+                        warnings.warn(f"Could not resolve class for: {original}")
+                        model_type = BaseModelTypes.NODE  # fallback to something safe
+                    uid = f"EXTRACT_{next(counter)}"
+                    registry[uid] = (original, model_type.name)
+                    if cls is not None:
+                        by_cls[cls] = uid
+                reverse[original] = uid
+                d[pickle_type] = uid
+        stack.extend(d.values())
 
-    new_data = recurse_json(data, callback)
-    new_data["REGISTRY"] = registry
-    return new_data
\ No newline at end of file
+    data["REGISTRY"] = registry
+    return data
@@ -12,8 +12,21 @@ def setup_loguru_logging():
         from loguru import logger
 
         class InterceptHandler(logging.Handler):
+            def __init__(self, level=logging.NOTSET):
+                super().__init__(level)
+                # logging levelno -> loguru level (its name, or the number if loguru doesn't know it)
+                self._level_cache = {}
+
             def emit(self, record):
-                logger.opt(depth=6, exception=record.exc_info).log(record.levelname, record.getMessage())
+                try:
+                    level = self._level_cache[record.levelno]
+                except KeyError:
+                    try:
+                        level = logger.level(record.levelname).name
+                    except ValueError:
+                        level = record.levelno
+                    self._level_cache[record.levelno] = level
+                logger.opt(depth=6, exception=record.exc_info).log(level, record.getMessage())
 
         logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
         logging.captureWarnings(True)
@@ -1,5 +1,8 @@
 import re
 
+from typing import Any, Callable
+from functools import lru_cache
+
 # Operators and parentheses only — keep field/regex together in parser phase
 # Also, ordering of the regex matters when compiling the token_re
 TOKEN_REGEX = [
@@ -10,6 +13,8 @@ TOKEN_REGEX = [
     ("EQ", r"="),
     ("LPAREN", r"\("),
     ("RPAREN", r"\)"),
+    # field name directly followed by its operator; the RHS literal is captured by smart_tokenize
+    ("FIELD", r"(?P<FIELD_NAME>[a-zA-Z_][\w]*)(?P<FIELD_OP>!=|=)"),
     ("IDENT", r"[a-zA-Z_][\w]*"),  # field name
     ("LITERAL", r"(?:[^&|()]+|\([^\)]+\))+"),      # regex literal; more greedy for now
 ]
@@ -17,50 +22,52 @@ TOKEN_REGEX = [
 token_re = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in TOKEN_REGEX))
 
 
+# Characters that can end a RHS literal: top-level `&` / `||`, or a paren (which changes depth)
+rhs_stop_re = re.compile(r"\|\||[&()]")
+
+
 def smart_tokenize(query: str):
     tokens = []
     pos = 0
-    while pos < len(query):
+    end = len(query)
+    while pos < end:
         match = token_re.match(query, pos)
         if not match:
             raise SyntaxError(f"Unexpected character at position {pos}: `{query[pos:]}` — Verify your syntax.")
         kind = match.lastgroup
-        value = match.group()
 
         if kind == "SKIP":
             pos = match.end()
             continue
 
-        # If IDENT followed by EQ or NEQ, capture entire RHS as LITERAL
-        if kind == "IDENT":
-            lookahead = token_re.match(query, match.end())
-            if lookahead and lookahead.lastgroup in ("EQ", "NEQ"):
-                field = value
-                op = lookahead.group()
-                pos = lookahead.end()
-                # Capture the RHS; up to next top-level & || or unmatched RPAREN
-                rhs_start = pos
-                depth = 0
-                while pos < len(query):
-                    char = query[pos]
-                    if char == '(':
-                        depth += 1
-                    elif char == ')':
-                        if depth == 0:
-                            break
-                        depth -= 1
-                    elif query[pos:pos+2] == '||' and depth == 0:
-                        break
-                    elif char == '&' and depth == 0:
+        # IDENT followed by EQ or NEQ (one token here), capture entire RHS as LITERAL
+        if kind == "FIELD":
+            op = match.group("FIELD_OP")
+            rhs_start = match.end()
+            # Capture the RHS; up to next top-level & || or unmatched RPAREN.
+            # Jump between delimiters instead of stepping through every character
+            depth = 0
+            pos = end
+            for stop in rhs_stop_re.finditer(query, rhs_start):
+                char = stop.group()
+                if char == "(":
+                    depth += 1
+                elif char == ")":
+                    if depth == 0:
+                        pos = stop.start()
                         break
-                    pos += 1
-                pattern = query[rhs_start:pos].strip()
-                tokens.append(("IDENT", field))
-                tokens.append(("EQ" if op == "=" else "NEQ", op))
-                tokens.append(("LITERAL", pattern))
-                continue
-
-        tokens.append((kind, value))
+                    depth -= 1
+                elif depth == 0:
+                    pos = stop.start()
+                    break
+            tokens.extend((
+                ("IDENT", match.group("FIELD_NAME")),
+                ("EQ" if op == "=" else "NEQ", op),
+                ("LITERAL", query[rhs_start:pos].strip()),
+            ))
+            continue
+
+        tokens.append((kind, match.group()))
         pos = match.end()
     return tokens
 
@@ -81,65 +88,119 @@ def parse_match(tokens, i):
     pattern = "".join(pattern_parts).strip()
     return ("MATCH", field, op, pattern), j
 
-def parse_expr(tokens, i=0):
-    def parse_atom(tokens, i):
-        if i >= len(tokens):
-            raise SyntaxError("Unexpected end of input")
-
-        tok = tokens[i]
-
-        if tok[0] == "LPAREN":
-            node, i = parse_expr(tokens, i + 1)
+BINARY_PRECEDENCE = {"OR": 1, "AND": 2}
 
+def parse_expr(tokens, i=0):
+    """
+    Parses `tokens` from position `i` into an AST, returning `(ast, next_position)`.
+    Iterative shunting-yard: `&` binds tighter than `||`, both left-associative.
+    Parsing stops at the first token that cannot continue the expression.
+    """
+    output = []       # operand stack (finished subtrees)
+    operators = []    # pending "and"/"or", with None marking an open parenthesis
+    expect_operand = True
+    pending_op = None # operator just consumed, for the end-of-input message
+
+    def reduce_top():
+        op = operators.pop()
+        right = output.pop()
+        output[-1] = (op, output[-1], right)
+
+    while True:
+        if expect_operand:
             if i >= len(tokens):
-                raise SyntaxError("Unclosed parenthesis. Expected ')' before end of input")
-
-            if tokens[i][0] != "RPAREN":
-                raise SyntaxError(f"Expected ')', got {tokens[i]} at position {i}") 
-            return node, i + 1
-
-        elif tok[0] == "IDENT":
-            return parse_match(tokens, i)
+                if pending_op:
+                    raise SyntaxError(f"Operator '{pending_op.upper()}' must be followed by a field expression, but input ended")
+                raise SyntaxError("Unexpected end of input")
 
-        else:
-            raise SyntaxError(f"Unexpected token '{tok[1]}' ({tok[0]}) at position {i} — expected field or '('")
-
-    def parse_binop(precedence, left, tokens, i):
-        while i < len(tokens):
             tok = tokens[i]
-            if tok[0] == "RPAREN":
-                break
-
-            if tok[0] not in ("AND", "OR"):
-                break
-
-            curr_prec = {"OR": 1, "AND": 2}[tok[0]]
-            if curr_prec < precedence:
-                break
+            pending_op = None
+            if tok[0] == "LPAREN":
+                operators.append(None)
+                i += 1
+            elif tok[0] == "IDENT":
+                node, i = parse_match(tokens, i)
+                output.append(node)
+                expect_operand = False
+            else:
+                raise SyntaxError(f"Unexpected token '{tok[1]}' ({tok[0]}) at position {i} — expected field or '('")
+            continue
 
-            op = tok[0].lower()
+        kind = tokens[i][0] if i < len(tokens) else None
+        if kind in BINARY_PRECEDENCE:
+            prec = BINARY_PRECEDENCE[kind]
+            while operators and operators[-1] is not None and BINARY_PRECEDENCE[operators[-1].upper()] >= prec:
+                reduce_top()
+            pending_op = kind.lower()
+            operators.append(pending_op)
+            expect_operand = True
             i += 1
+            continue
 
-            if i >= len(tokens):
-                raise SyntaxError(f"Operator '{op.upper()}' must be followed by a field expression, but input ended")
-
-            right, i = parse_atom(tokens, i)
-
-            # Check for more tightly bound ops
-            while i < len(tokens):
-                if tokens[i][0] in ("AND", "OR"):
-                    next_prec = {"OR": 1, "AND": 2}[tokens[i][0]]
-                    if next_prec > curr_prec:
-                        right, i = parse_binop(next_prec, right, tokens, i)
-                    else:
-                        break
-                else:
-                    break
-
-            left = (op, left, right)
-
-        return left, i
-
+        # Anything else ends the innermost open group (or the whole expression)
+        while operators and operators[-1] is not None:
+            reduce_top()
+        if not operators:
+            return output[0], i
 
-    left, i = parse_atom(tokens, i)
-    return parse_binop(0, left, tokens, i)
\ No newline at end of file
+        if i >= len(tokens):
+            raise SyntaxError("Unclosed parenthesis. Expected ')' before end of input")
+        if kind != "RPAREN":
+            raise SyntaxError(f"Expected ')', got {tokens[i]} at position {i}")
+        operators.pop()
+        i += 1
+
+
+@lru_cache(maxsize=128)
+def parse_query(query: str):
+    """Tokenizes and parses `query` into its AST (cached by query string)."""
+    tokens = smart_tokenize(query)
+    ast, i = parse_expr(tokens)
+    if i != len(tokens):
+        raise SyntaxError(f"Unexpected trailing tokens: {tokens[i:]}")
+    return ast
+
+def query_fields(ast) -> set[str]:
+    """Every field name a parsed query matches against."""
+    if not isinstance(ast, tuple):
+        return set()
+    if ast[0] == 'MATCH':
+        return {ast[1]}
+    return query_fields(ast[1]) | query_fields(ast[2])
+
+def compile_ast(ast) -> Callable[[Any], bool]:
+    """
+    Generates a single `lambda n: ...` expression for the AST, closing over
+    the compiled MATCH patterns, so evaluation needs no per-object tree walk.
+    Fields are read with getattr; a missing or None field never matches.
+    """
+    patterns: dict[str, re.Pattern] = {}
+
+    def emit(node) -> str:
+        if not isinstance(node, tuple):
+            return "False"
+        tag = node[0]
+        if tag == 'MATCH':
+            field, op, pattern = node[1], node[2], node[3]
+            if op not in ('=', '!='):
+                raise ValueError(f"Unknown operator: {op}")
+            try:
+                regex = re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid regex: {pattern!r} ({e})")
+            name = f"_p{len(patterns)}"
+            patterns[name] = regex
+            test = "is not None" if op == '=' else "is None"
+            return (f"((_v := getattr(n, {field!r}, None)) is not None"
+                    f" and {name}.search(str(_v)) {test})")
+        if tag in ('or', 'and'):
+            return f"({emit(node[1])} {tag} {emit(node[2])})"
+        return "False"
+
+    code = compile(f"lambda n: {emit(ast)}", "<query>", "eval")
+    return eval(code, {"__builtins__": {"getattr": getattr, "str": str}, **patterns})
+
+@lru_cache(maxsize=128)
+def compile_query(query: str) -> Callable[[Any], bool]:
+    """Parses `query` once and returns its compiled predicate (cached by query string)."""
+    return compile_ast(parse_query(query))
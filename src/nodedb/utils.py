@@ -1,39 +1,106 @@
 # utils.py
-import gc
 import sys
 import inspect
 import importlib
 import warnings
 
-from typing import Any, Dict, Type
+from typing import Any, Dict, Optional, Type
+from collections import deque
 from functools import lru_cache
 
+class _AutoDescriptor:
+    """
+    Public accessor for an annotated field, backed by the private `_<field>` attribute
+    (an instance attribute or a slot). One small object per field, with the private
+    name precomputed, instead of a property whose lambdas rebuild it on every access.
+    """
+    __slots__ = ("name", "private", "default")
+
+    def __init__(self, name: str, default: Any = None):
+        self.name = name
+        self.private = f"_{name}"
+        self.default = default
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance, self.private, self.default)
+
+    def __set__(self, instance, value):
+        setattr(instance, self.private, value)
+
+class _WatchedDescriptor(_AutoDescriptor):
+    """Also reports each change through `instance._on_field_set(name, old, new)`."""
+    __slots__ = ()
+
+    def __set__(self, instance, value):
+        old = getattr(instance, self.private, None)
+        setattr(instance, self.private, value)
+        instance._on_field_set(self.name, old, value)
+
 class AutoPropertiesMeta(type):
     def __new__(cls, name, bases, dct):
         # For every annotated field, pull off any class‐level default
-        # and install a private backing field + a public property
+        # and install a private backing field + a public descriptor
         annotations = dct.get("__annotations__", {})
+
+        # Fields listed in `__watched_fields__` (own or inherited) also report
+        # changes through `self._on_field_set(attr, old, new)`
+        watched = dct.get("__watched_fields__")
+        if watched is None:
+            watched = next(
+                (b.__watched_fields__ for b in bases if hasattr(b, "__watched_fields__")), ()
+            )
+
+        # Classes declaring `__slots__` get their backing fields as slots instead;
+        # the default then lives on the descriptor, since a slot can't have a class value
+        slotted = "__slots__" in dct
+        backing = []
+
         for attr in annotations:
             default = dct.pop(attr, None)
-            dct[f"_{attr}"] = default
-            dct[attr] = property(
-                lambda self, attr=attr: getattr(self, f"_{attr}", None),
-                lambda self, value, attr=attr: setattr(self, f"_{attr}", value)
-            )
+            if slotted:
+                backing.append(f"_{attr}")
+            else:
+                dct[f"_{attr}"] = default
+            descriptor = _WatchedDescriptor if attr in watched else _AutoDescriptor
+            dct[attr] = descriptor(attr, default)
+
+        if slotted:
+            slots = dct["__slots__"]
+            slots = (slots,) if isinstance(slots, str) else tuple(slots)
+            dct["__slots__"] = slots + tuple(b for b in backing if b not in slots)
         return super().__new__(cls, name, bases, dct)
 
 
+class _OldNameAlias:
+    """Old attribute name that reads and writes through to its replacement."""
+    __slots__ = ("new_attr",)
+
+    def __init__(self, new_attr: str):
+        self.new_attr = new_attr
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance, self.new_attr, None)
+
+    def __set__(self, instance, value):
+        setattr(instance, self.new_attr, value)
+
 class OldVariableNamesMeta(AutoPropertiesMeta):
     def __new__(cls, name, bases, dct):
         original_init = dct.get("__init__")
         old_map = dct.get("__old_mappings__", {})
 
         # 1) Wrap __init__ to remap old-kwargs -> new-attrs on construction
+        old_keys = frozenset(old_map)
+
         def new_init(self, *args, **kwargs):
-            extra: Dict[str, Any] = {}
-            for old, new in old_map.items():
-                if old in kwargs:
-                    extra[new] = kwargs.pop(old)
+            # Common case: no old names passed, so no remapping dict at all
+            extra: Optional[Dict[str, Any]] = None
+            if not old_keys.isdisjoint(kwargs):
+                extra = {new: kwargs.pop(old) for old, new in old_map.items() if old in kwargs}
 
             if original_init:
                 original_init(self, *args, **kwargs)
@@ -44,19 +111,16 @@ class OldVariableNamesMeta(AutoPropertiesMeta):
                         bi(self, *args, **kwargs)
                         break
 
-            for new, val in extra.items():
-                setattr(self, new, val)
+            if extra:
+                for new, val in extra.items():
+                    setattr(self, new, val)
 
         dct["__init__"] = new_init
 
-        # 2) Install proxy properties so .old_name ↔ .new_name
-        def make_proxy(old, new):
-            return property(
-                lambda self: getattr(self, new),
-                lambda self, v: setattr(self, new, v)
-            )
+        # 2) Install proxy descriptors so .old_name ↔ .new_name
         for old, new in old_map.items():
-            dct[old] = make_proxy(old, new)
+            if old != new:
+                dct[old] = _OldNameAlias(new)
 
         # 3) Ensure pickle/jsonpickle will call your __getstate__/__setstate__
         #    by overriding __reduce__ to return (cls, (), state_dict)
@@ -79,20 +143,11 @@ def handle_old_variable_names(cls):
 
     cls.__init__ = new_init
 
-    # Add property behavior for the old variable names to point to the new ones
-    def add_old_name_property(attr, new_attr):
-        def getter(self):
-            return getattr(self, new_attr, None)  # Return the value of the new attribute
-
-        def setter(self, value):
-            setattr(self, new_attr, value)  # Set the value for the new attribute
-
-        return property(getter, setter)
-
-    # Check for old mappings and add properties for them
+    # Check for old mappings and point each old name at the new attribute
     old_mappings = getattr(cls, "__old_mappings__", {})
     for old_attr, new_attr in old_mappings.items():
-        setattr(cls, old_attr, add_old_name_property(old_attr, new_attr))
+        if old_attr != new_attr:
+            setattr(cls, old_attr, _OldNameAlias(new_attr))
 
     return cls
 
@@ -126,50 +181,49 @@ def generate_name_alias(name: str, min_length:int = 3, max_length: int = 3, forc
         str: The generated alias.
     """
     name = name.lower()
-    if '_' in name:
-        words = name.split('_')
-    elif ' ' in name:
-        words = name.split(' ')
-    else:
-        words = [name]  # fallback if no separators
+    # Underscores take priority; a name with neither separator is a single word
+    words = name.split('_' if '_' in name else ' ')
 
     alias = ''.join([word[0] for word in words if word])
 
-    # If alias is too short, continue adding more letters from words
+    # If alias is too short, continue adding more letters from words (in order, after their initials)
     if len(alias) < min_length:
-        for word in words:
-            i = 1  # start after first letter
-            while len(alias) < min_length and i < len(word):
-                alias += word[i]
-                i += 1
+        alias = (alias + ''.join([word[1:] for word in words]))[:min_length]
 
     return alias[:max_length]  # cut off at max_length
 
-def recurse_json(obj, callback):
+def recurse_json(obj, callback, trigger_keys=None):
     """
-    Recursively walk a JSON-like structure, applying `callback` to every dict.
+    Walk a JSON-like structure, applying `callback` to every dict.
+    Works in place with an explicit stack (no recursion limit on deep data):
+    each dict is replaced by `callback(dict)` before its values are visited.
+    With `trigger_keys` (a set/frozenset), only dicts holding at least one of
+    those keys are passed to `callback`; the rest are just walked.
     """
-    if isinstance(obj, dict):
-        # First recurse into all values
-        result = {}
-        for key, value in obj.items():
-            result[key] = recurse_json(value, callback)
-        return callback(result)  # Apply after recursion
-
-    elif isinstance(obj, list):
-        return [recurse_json(item, callback) for item in obj]
-
-    else:
-        return obj  # primitive
+    root = [obj]
+    stack = deque([(root, 0)])
+    while stack:
+        container, key = stack.pop()
+        value = container[key]
+        if isinstance(value, dict):
+            if trigger_keys is None or not trigger_keys.isdisjoint(value):
+                value = callback(value)
+                container[key] = value
+            if isinstance(value, dict):
+                stack.extend((value, k) for k in value)
+        elif isinstance(value, list):
+            stack.extend((value, i) for i in range(len(value)))
+    return root[0]
 
 def get_all_loaded_classes(clear_cache=False):
     if clear_cache:
-        __get_all_loaded_classes__.cache_clear()
-    return __get_all_loaded_classes__
+        get_all_classes_from_loaded_modules(clear_cache=True)
+    return __get_all_loaded_classes__()
 
-@lru_cache(1)
 def __get_all_loaded_classes__():
-    return [obj for obj in gc.get_objects() if isinstance(obj, type)]
+    # Classes reachable from loaded modules; reuses the cached sys.modules scan
+    # rather than walking every object on the heap
+    return list(__get_all_classes_from_loaded_modules__().values())
 
 def get_all_classes_from_specific_loaded_module(module_namespace:str, clear_cache=False):
     """
@@ -200,23 +254,65 @@ def get_all_classes_from_loaded_modules(clear_cache=False):
     Interface for a function with a simialar name for easy cache clear.
     """
     if clear_cache:
-        __get_all_classes_from_loaded_modules__.cache_clear()
+        _loaded_classes.clear()
+        _scanned_modules.clear()
+        _loaded_modules_count[0] = -1
+        # Path resolutions in jpickle_ex were made against the old class map
+        from .jpickle_ex import clear_class_resolve_caches
+        clear_class_resolve_caches()
     return __get_all_classes_from_loaded_modules__()
 
-@lru_cache(maxsize=1)
+def loaded_classes_version() -> int:
+    """
+    Brings the loaded-class map up to date and returns a counter that changes
+    whenever it does, for keying caches derived from the map.
+    """
+    __get_all_classes_from_loaded_modules__()
+    return _loaded_classes_version[0]
+
+# {cls_import_path: cls_obj}, plus the names of the `sys.modules` entries it has seen
+# and how many entries there were. Only modules missing from `_scanned_modules` need
+# scanning; the count keeps calls constant-time while `sys.modules` is unchanged
+_loaded_classes: Dict[str, Type] = {}
+_scanned_modules: set[str] = set()
+_loaded_modules_count = [-1]
+_loaded_classes_version = [0]
+
 def __get_all_classes_from_loaded_modules__():
     """Gets all classes and returns a dict in the format {cls_import_path:cls_obj}
-    Uses lru_cache with max_size = 1.
-    Use cache_clear to force a clear.
+    Updated incrementally: when the number of `sys.modules` entries changed, only
+    modules it has not seen yet are scanned (including ones removed and imported again).
+    Removals balanced by exactly as many imports between two calls go unnoticed until
+    the count changes; use `get_all_classes_from_loaded_modules(clear_cache=True)`
+    to force a rebuild.
     """
-    classes = {}
-    for module in list(sys.modules.values()):
+    if len(sys.modules) == _loaded_modules_count[0]:
+        return _loaded_classes
+
+    modules = dict(sys.modules)
+    _loaded_modules_count[0] = len(modules)
+    new_names = modules.keys() - _scanned_modules
+    if len(_scanned_modules) + len(new_names) != len(modules):
+        # Forget removed modules so they are scanned again if re-imported
+        _scanned_modules.intersection_update(modules)
+    if not new_names:
+        return _loaded_classes
+
+    # In import order, like a full scan of `sys.modules`
+    for key, module in modules.items():
+        if key not in new_names:
+            continue
         if module and hasattr(module, "__dict__"):
-            for name, obj in module.__dict__.items():
-                if inspect.isclass(obj):
-                    full_path = f"{obj.__module__}.{obj.__qualname__}"
-                    classes[full_path] = obj
-    return classes
+            for name, obj in list(module.__dict__.items()):
+                if isinstance(obj, type):
+                    module_name = obj.__module__
+                    if not isinstance(module_name, str):
+                        # e.g. metaclass internals exposing the `__module__` descriptor itself
+                        continue
+                    _loaded_classes[f"{module_name}.{obj.__qualname__}"] = obj
+    _scanned_modules.update(new_names)
+    _loaded_classes_version[0] += 1
+    return _loaded_classes
 
 def get_all_subclasses_of(base_cls: Type) -> Dict[str, Type]:
     """
@@ -0,0 +1,42 @@
+from nodedb.database import Graph
+from nodedb.base_models import Node, Edge
+
+__author__ = "rrenode"
+__copyright__ = "rrenode"
+__license__ = "MIT"
+
+
+def test_ad_hoc_attributes_are_kept_and_exported():
+    node = Node("a")
+    node.color = "red"
+    assert node.csv_headers()[-1] == "color"
+    assert node.as_csv()[-1] == "red"
+    assert node.as_dict()["color"] == "red"
+    assert node.as_dict()["name"] == "a"
+
+    g = Graph()
+    g.meta = 1
+    assert g.meta == 1
+    edge = Edge("e", node, node)
+    edge.weight = 2
+    assert edge.weight == 2
+
+
+class BareNode(Node):
+    def __init__(self, name):
+        # Deliberately skips Node.__init__
+        self.name = name
+
+
+def test_subclass_without_super_init():
+    a, b = BareNode("a"), BareNode("b")
+    g = Graph()
+    g.add_node(a)
+    g.add_node(b)
+    edge = Edge("ab", a, b)
+    g.add_edge(edge)
+
+    assert g.get_node_by_name("a") is a
+    assert g.get_edges_from(a) == [edge]
+    a.name = "renamed"
+    assert g.get_node_by_name("renamed") is a
@@ -0,0 +1,336 @@
+import pytest
+
+from nodedb.database import Graph
+from nodedb.base_models import Node, Edge
+
+__author__ = "rrenode"
+__copyright__ = "rrenode"
+__license__ = "MIT"
+
+
+def test_node_belongs_to_one_graph():
+    g1, g2 = Graph(), Graph()
+    a, b = Node("a"), Node("b")
+    g1.add_node(a)
+    g1.add_node(b)
+    g1.add_edge(Edge("ab", a, b))
+
+    with pytest.raises(ValueError):
+        g2.add_node(a)
+    with pytest.raises(ValueError):
+        g2.add_edge(Edge("ba", b, Node("c")))
+    assert g2.nodes == [] and g2.edges == []
+
+    # Once removed from its graph the node can move
+    g1.remove_node(a)
+    g2.add_node(a)
+    a.name = "renamed"
+    assert g2.get_node_by_name("renamed") is a
+    assert g1.get_node_by_name("renamed") is None
+    assert g2.get_edges_from(a) == []
+
+
+def test_add_node_twice_is_rejected():
+    g = Graph()
+    n = Node("n")
+    g.add_node(n)
+    with pytest.raises(ValueError):
+        g.add_node(n)
+
+    g.remove_node(n)
+    assert g.nodes == []
+    assert g.get_node_by_alias("n") is None
+    assert g.get_node_by_name("n") is None
+
+
+def test_add_node_failure_leaves_nodes_unchanged():
+    g = Graph()
+    bad = Node("bad")
+    bad.alias = ["unhashable"]
+    with pytest.raises(TypeError):
+        g.add_node(bad)
+    assert g.nodes == []
+
+
+def test_shared_id_survives_removal():
+    g = Graph()
+    a = Node("a", id="11111111-0000-0000-0000-000000000000")
+    b = Node("b", id="11111111-0000-0000-0000-000000000000")
+    g.add_node(a)
+    g.add_node(b)
+    assert g.get_node_by_id(str(a.id)) is a
+
+    g.remove_node(a)
+    assert g.get_node_by_id(str(b.id)) is b
+    assert g.get_node_by_id(b.id) is b
+    assert g.match_closest_node_id("1111") is b
+
+    g.remove_node(b)
+    assert g.get_node_by_id(str(b.id)) is None
+    assert g.match_closest_node_id("1111") is None
+
+
+def test_index_buckets_follow_node_order():
+    g = Graph()
+    a, b, p = Node("a"), Node("b"), Node("p")
+    for node in (p, a, b):
+        g.add_node(node)
+    b.alias = "x"
+    a.alias = "x"
+    assert g.get_node_by_alias("x") is a
+    b.name = "same"
+    a.name = "same"
+    assert g.get_node_by_name("same") is a
+    b.id = p.id
+    assert g.get_node_by_id(p.id) is p
+    a.id = p.id
+    g.remove_node(p)
+    assert g.get_node_by_id(b.id) is a
+
+    b.parent = p
+    a.parent = p
+    assert g.get_children(p) == [a, b]
+
+
+class EqualByName(Node):
+    def __eq__(self, other):
+        return isinstance(other, Node) and other.name == self.name
+
+    __hash__ = Node.__hash__
+
+
+class EqualEdge(Edge):
+    def __eq__(self, other):
+        return isinstance(other, Edge) and other.name == self.name
+
+    __hash__ = Edge.__hash__
+
+
+def test_removal_uses_identity_not_equality():
+    g = Graph()
+    parent = Node("p")
+    x1, x2 = EqualByName("x"), EqualByName("x")
+    x1.parent = x2.parent = parent
+    for node in (parent, x1, x2):
+        g.add_node(node)
+    e1, e2 = EqualEdge("e", parent, x1), EqualEdge("e", parent, x2)
+    g.add_edge(e1)
+    g.add_edge(e2)
+
+    g.remove_edge(e2)
+    assert g.edges == [e1] and g.edges[0] is e1
+    assert g.get_edges_from(parent)[0] is e1
+    assert g.get_edges_to(x1)[0] is e1
+
+    g.remove_node(x2)
+    assert g.get_node_by_name("x") is x1
+    assert g.get_node_by_alias(x1.alias) is x1
+    assert g.get_children(parent)[0] is x1
+    assert g.get_edges_to(x1)[0] is e1
+
+
+def test_reassigning_edge_endpoints_relinks():
+    g, other = Graph(), Graph()
+    a, b, c = Node("a"), Node("b"), Node("c")
+    for node in (a, b, c):
+        g.add_node(node)
+    edge = Edge("e", a, b)
+    g.add_edge(edge)
+
+    edge.node_b = c
+    assert g.get_edges_to(c) == [edge]
+    assert g.get_edges_to(b) == []
+    edge.node_a = b
+    assert g.get_edges_from(b) == [edge]
+    assert g.get_edges_from(a) == []
+    assert g.summary()["isolated_nodes"] == 1
+
+    foreign = Node("f")
+    other.add_node(foreign)
+    with pytest.raises(ValueError):
+        edge.node_b = foreign
+    assert edge.node_b is c
+    assert g.get_edges_to(c) == [edge]
+
+
+def test_remove_nodes_ignores_foreign_nodes():
+    g, h = Graph(), Graph()
+    a, b = Node("a"), Node("b")
+    h.add_node(a)
+    h.add_node(b)
+    edge = Edge("ab", a, b)
+    h.add_edge(edge)
+
+    g.remove_nodes([a])
+    g.remove_node(b)
+
+    assert h.nodes == [a, b]
+    assert h.edges == [edge]
+    assert h.get_edges_from(a) == [edge]
+    assert h.get_edges_to(b) == [edge]
+    assert h.get_node_by_name("a") is a
+
+
+def test_match_closest_node_id_prefix_after_updates():
+    g = Graph()
+    a = Node("a", id="11111111-0000-0000-0000-000000000000")
+    b = Node("b", id="22222222-0000-0000-0000-000000000000")
+    g.add_node(a)
+    g.add_node(b)
+    assert g.match_closest_node_id("2222") is b
+
+    g.remove_node(b)
+    c = Node("c", id="22223333-0000-0000-0000-000000000000")
+    g.add_node(c)
+    assert g.match_closest_node_id("2222") is c
+
+    c.id = "33333333-0000-0000-0000-000000000000"
+    assert g.match_closest_node_id("3333") is c
+    assert g.match_closest_node_id("1111") is a
+
+
+def test_find_nodes_by_regex_multi_matches_re():
+    import re
+
+    g = Graph()
+    names = ["é", "café_x", "CAFÉ", "plain", "naïve words", "x1"]
+    for name in names:
+        g.add_node(Node(name))
+    patterns = [r"^.$", r"^\w+$", r"(?i)café", r"\d", r"é\b", r"^p"]
+
+    for pattern in patterns:
+        expected = [n for n in names if re.search(pattern, n)]
+        got = [n.name for n in g.find_nodes_by_regex_multi("name", [pattern])]
+        assert got == expected, pattern
+    got = [n.name for n in g.find_nodes_by_regex_multi("name", [r"\d", r"^p"])]
+    assert got == ["plain", "x1"]
+    assert g.find_nodes_by_regex_multi("name", []) == []
+
+
+def test_find_nodes_by_regex_multi_paths_agree(monkeypatch):
+    import re
+
+    from nodedb import database
+
+    g = Graph()
+    names = ["a", "a\n", "xx", "x{,3}", "é\n", "bad\ud800x", "plain"]
+    for name in names:
+        g.add_node(Node(name))
+    pattern_sets = [
+        [r"a\Z"], [r"x{,3}$"], [r"^x{,}$"], [r"x"], [r"a$", r"^p"], [r"\w\Z", r"^b"],
+    ]
+
+    with_default = [[n.name for n in g.find_nodes_by_regex_multi("name", ps)] for ps in pattern_sets]
+    # The `re` path, with or without Hyperscan installed
+    monkeypatch.setattr(database, "hyperscan", None)
+    with_re = [[n.name for n in g.find_nodes_by_regex_multi("name", ps)] for ps in pattern_sets]
+
+    expected = [[n for n in names if any(re.search(p, n) for p in ps)] for ps in pattern_sets]
+    assert with_default == with_re == expected
+
+
+def test_difflib_fallback_matches_sequence_matcher(monkeypatch):
+    import difflib
+    import random
+
+    from nodedb import database
+
+    # Force the stdlib path even when RapidFuzz is installed
+    monkeypatch.setattr(database, "process", None)
+
+    rng = random.Random(5)
+    words = ["".join(rng.choice("abcab ") for _ in range(rng.randint(1, 12))) for _ in range(60)]
+    g = Graph()
+    for word in words:
+        g.add_node(Node(word))
+
+    for _ in range(200):
+        query = "".join(rng.choice("abc ") for _ in range(rng.randint(1, 12)))
+        best, best_ratio = None, 0
+        for node in g.nodes:
+            if node.name == query:
+                best = node
+                break
+            ratio = difflib.SequenceMatcher(None, query, node.name, autojunk=False).ratio()
+            if ratio > best_ratio:
+                best, best_ratio = node, ratio
+        if best is not None and best.name != query and best_ratio < 0.5:
+            best = None
+        assert g.match_closest_node_name(query, match_cutoff=0.5) is best, query
+
+
+def _sample_graph():
+    g = Graph()
+    a, b, c = Node("todo app"), Node("build_tools"), Node("child thing")
+    c.parent = a
+    for node in (a, b, c):
+        g.add_node(node)
+    ab, bc = Edge("ab", a, b), Edge("bc", b, c)
+    g.add_edge(ab)
+    g.add_edge(bc)
+    return g, (a, b, c), (ab, bc)
+
+
+def test_write_csv():
+    import csv
+    import io
+
+    g, (a, b, c), _ = _sample_graph()
+    buffer = io.StringIO(newline="")
+    g.write_csv(buffer)
+    rows = list(csv.reader(io.StringIO(buffer.getvalue())))
+
+    data, header = g.csv_nodes()
+    assert rows[0] == header == a.csv_headers()
+    assert rows[1:] == [["" if v is None else str(v) for v in row] for row in data]
+    assert rows[3][header.index("parent")] == str(a.id)
+
+    empty = io.StringIO()
+    Graph().write_csv(empty)
+    assert empty.getvalue() == ""
+
+
+def test_save_binary_round_trip(tmp_path):
+    g, (a, b, c), _ = _sample_graph()
+    path = tmp_path / "graph.pkl"
+    g.save_binary(path)
+    loaded = Graph.load_binary(path)
+
+    la, lb, lc = loaded.nodes
+    assert [n.name for n in loaded.nodes] == ["todo app", "build_tools", "child thing"]
+    assert [n.id for n in loaded.nodes] == [a.id, b.id, c.id]
+    assert lc.parent is la
+    assert loaded.get_children(la) == [lc]
+    assert [(e.name, e.node_a, e.node_b) for e in loaded.edges] == [("ab", la, lb), ("bc", lb, lc)]
+    assert loaded.get_node_by_alias(b.alias) is lb
+    assert loaded.get_edges_from(lb) == [loaded.edges[1]]
+
+    with pytest.raises(ValueError):
+        g.save_binary(tmp_path)
+
+
+def test_remove_edge():
+    g, (a, b, c), (ab, bc) = _sample_graph()
+    g.remove_edge(ab)
+    assert g.edges == [bc]
+    assert g.get_edges_from(a) == []
+    assert g.get_edges_to(b) == []
+    assert b.edges == [bc]
+    with pytest.raises(ValueError):
+        g.remove_edge(ab)
+
+
+def test_remove_nodes():
+    g, (a, b, c), (ab, bc) = _sample_graph()
+    g.remove_nodes([b, c])
+    assert g.nodes == [a]
+    assert g.edges == []
+    assert a.edges == []
+    assert g.get_children(a) == []
+    assert g.get_node_by_name("build_tools") is None
+    assert g.get_node_by_id(c.id) is None
+    assert g.match_closest_node_id(str(b.id)[:8]) is None
+
+    # Removed nodes no longer report changes to the graph
+    b.name = "todo app"
+    assert g.get_node_by_name("todo app") is a
@@ -0,0 +1,242 @@
+import random
+import re
+
+import pytest
+
+from nodedb.database import Graph
+from nodedb.base_models import Node
+from nodedb.query import compile_query, parse_expr, parse_query, smart_tokenize
+
+__author__ = "rrenode"
+__copyright__ = "rrenode"
+__license__ = "MIT"
+
+
+# ─────────────────────────────────────────────
+# Reference implementations: the original per-character tokenizer,
+# recursive-descent parser and tree-walking evaluator
+# ─────────────────────────────────────────────
+
+_REF_TOKEN_RE = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in [
+    ("SKIP", r"\s+"),
+    ("OR", r"\|\|"),
+    ("AND", r"&"),
+    ("NEQ", r"!="),
+    ("EQ", r"="),
+    ("LPAREN", r"\("),
+    ("RPAREN", r"\)"),
+    ("IDENT", r"[a-zA-Z_][\w]*"),
+    ("LITERAL", r"(?:[^&|()]+|\([^\)]+\))+"),
+]))
+
+
+def ref_tokenize(query):
+    tokens = []
+    pos = 0
+    while pos < len(query):
+        match = _REF_TOKEN_RE.match(query, pos)
+        if not match:
+            raise SyntaxError(f"Unexpected character at position {pos}: `{query[pos:]}` — Verify your syntax.")
+        kind = match.lastgroup
+        value = match.group()
+
+        if kind == "SKIP":
+            pos = match.end()
+            continue
+
+        if kind == "IDENT":
+            lookahead = _REF_TOKEN_RE.match(query, match.end())
+            if lookahead and lookahead.lastgroup in ("EQ", "NEQ"):
+                op = lookahead.group()
+                pos = lookahead.end()
+                rhs_start = pos
+                depth = 0
+                while pos < len(query):
+                    char = query[pos]
+                    if char == '(':
+                        depth += 1
+                    elif char == ')':
+                        if depth == 0:
+                            break
+                        depth -= 1
+                    elif query[pos:pos+2] == '||' and depth == 0:
+                        break
+                    elif char == '&' and depth == 0:
+                        break
+                    pos += 1
+                tokens.append(("IDENT", value))
+                tokens.append(("EQ" if op == "=" else "NEQ", op))
+                tokens.append(("LITERAL", query[rhs_start:pos].strip()))
+                continue
+
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+def ref_parse_match(tokens, i):
+    if tokens[i][0] != "IDENT":
+        raise SyntaxError(f"Expected field name but got '{tokens[i][1]}' ({tokens[i][0]}) at position {i}")
+    field = tokens[i][1]
+
+    if tokens[i+1][0] not in ("EQ", "NEQ"):
+        raise SyntaxError("Expected = or !=")
+    op = tokens[i+1][1]
+
+    pattern_parts = []
+    j = i + 2
+    while j < len(tokens) and tokens[j][0] not in ("AND", "OR", "RPAREN"):
+        pattern_parts.append(tokens[j][1])
+        j += 1
+    return ("MATCH", field, op, "".join(pattern_parts).strip()), j
+
+
+def ref_parse_expr(tokens, i=0):
+    def parse_atom(tokens, i):
+        if i >= len(tokens):
+            raise SyntaxError("Unexpected end of input")
+        tok = tokens[i]
+        if tok[0] == "LPAREN":
+            node, i = ref_parse_expr(tokens, i + 1)
+            if i >= len(tokens):
+                raise SyntaxError("Unclosed parenthesis. Expected ')' before end of input")
+            if tokens[i][0] != "RPAREN":
+                raise SyntaxError(f"Expected ')', got {tokens[i]} at position {i}")
+            return node, i + 1
+        elif tok[0] == "IDENT":
+            return ref_parse_match(tokens, i)
+        else:
+            raise SyntaxError(f"Unexpected token '{tok[1]}' ({tok[0]}) at position {i} — expected field or '('")
+
+    def parse_binop(precedence, left, tokens, i):
+        while i < len(tokens):
+            tok = tokens[i]
+            if tok[0] not in ("AND", "OR"):
+                break
+            curr_prec = {"OR": 1, "AND": 2}[tok[0]]
+            if curr_prec < precedence:
+                break
+            op = tok[0].lower()
+            i += 1
+            if i >= len(tokens):
+                raise SyntaxError(f"Operator '{op.upper()}' must be followed by a field expression, but input ended")
+            right, i = parse_atom(tokens, i)
+            while i < len(tokens) and tokens[i][0] in ("AND", "OR"):
+                next_prec = {"OR": 1, "AND": 2}[tokens[i][0]]
+                if next_prec <= curr_prec:
+                    break
+                right, i = parse_binop(next_prec, right, tokens, i)
+            left = (op, left, right)
+        return left, i
+
+    left, i = parse_atom(tokens, i)
+    return parse_binop(0, left, tokens, i)
+
+
+def ref_evaluate(ast, node):
+    tag = ast[0]
+    if tag == 'MATCH':
+        value = getattr(node, ast[1], None)
+        if value is None:
+            return False
+        found = re.search(ast[3], str(value)) is not None
+        return found if ast[2] == '=' else not found
+    if tag == 'or':
+        return ref_evaluate(ast[1], node) or ref_evaluate(ast[2], node)
+    return ref_evaluate(ast[1], node) and ref_evaluate(ast[2], node)
+
+
+def _outcome(func, arg):
+    try:
+        return func(arg)
+    except (SyntaxError, IndexError) as e:
+        return (type(e).__name__, str(e))
+
+
+# ─────────────────────────────────────────────
+# Randomized equivalence with the reference implementations
+# ─────────────────────────────────────────────
+
+def test_tokenizer_matches_reference():
+    rng = random.Random(1)
+    alphabet = list("ab_ =!&|()x9 .*^$\\[]") + ["||", "name=", "alias!=", "(", ")"]
+    for _ in range(5000):
+        query = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+        assert _outcome(smart_tokenize, query) == _outcome(ref_tokenize, query), query
+
+
+def test_parser_matches_reference():
+    rng = random.Random(2)
+    kinds = [("IDENT", "f"), ("EQ", "="), ("NEQ", "!="), ("LITERAL", "x"),
+             ("AND", "&"), ("OR", "||"), ("LPAREN", "("), ("RPAREN", ")")]
+    atoms = [[("IDENT", "a"), ("EQ", "="), ("LITERAL", "1")],
+             [("IDENT", "b"), ("NEQ", "!="), ("LITERAL", "2")]]
+    for _ in range(5000):
+        tokens = []
+        for _ in range(rng.randint(0, 9)):
+            tokens += rng.choice(atoms) if rng.random() < 0.45 else [rng.choice(kinds)]
+        assert _outcome(parse_expr, tokens) == _outcome(ref_parse_expr, tokens), tokens
+
+
+def _random_graph(rng):
+    g = Graph()
+    for _ in range(40):
+        g.add_node(Node("".join(rng.choice("ab_ c") for _ in range(rng.randint(1, 8))).strip() or "a"))
+    return g
+
+
+def _random_queries(rng, count):
+    atoms = ["name=a", "name!=b", "alias=^a", "alias!=c$", "name=(a|c)", "missing=a"]
+    for _ in range(count):
+        query = rng.choice(atoms)
+        for _ in range(rng.randint(0, 4)):
+            query = f"{query} {rng.choice(['&', '||'])} {rng.choice(atoms)}"
+            if rng.random() < 0.3:
+                query = f"({query})"
+        yield query
+
+
+def test_compiled_queries_match_reference():
+    rng = random.Random(4)
+    g = _random_graph(rng)
+    for query in _random_queries(rng, 300):
+        ast = parse_query(query)
+        predicate = compile_query(query)
+        assert [n for n in g.nodes if predicate(n)] == [n for n in g.nodes if ref_evaluate(ast, n)], query
+
+
+def test_find_nodes_by_query_matches_reference():
+    # Queries on watched fields only run on column masks; `missing` uses the predicate
+    rng = random.Random(6)
+    g = _random_graph(rng)
+    for query in _random_queries(rng, 300):
+        ast = parse_query(query)
+        assert g.find_nodes_by_query(query) == [n for n in g.nodes if ref_evaluate(ast, n)], query
+
+    # Masks are cached per field and must follow renames
+    g.nodes[0].name = "zzz"
+    assert g.find_nodes_by_query("name=zzz") == [g.nodes[0]]
+
+
+# ─────────────────────────────────────────────
+# Behaviour
+# ─────────────────────────────────────────────
+
+def test_compile_query():
+    todo, tools = Node("todo app"), Node("build_tools")
+    predicate = compile_query("name=^todo & alias!=x")
+    assert predicate(todo) and not predicate(tools)
+    assert compile_query("name=app || name=tools")(tools)
+    assert compile_query("(name=todo || name=build) & alias=bt")(tools)
+    assert not compile_query("color=red")(todo)
+    assert compile_query("name=^todo") is compile_query("name=^todo")
+    assert parse_query("name=a") == ("MATCH", "name", "=", "a")
+
+
+def test_compile_query_errors():
+    with pytest.raises(ValueError):
+        compile_query("name=(")
+    with pytest.raises(SyntaxError):
+        compile_query("name=a &")
+    with pytest.raises(SyntaxError):
+        compile_query("(name=a")
@@ -0,0 +1,120 @@
+import math
+
+import pytest
+
+from nodedb.database import Graph
+from nodedb.base_models import Node, Edge
+from nodedb.jpickle_ex import dump_json
+
+__author__ = "rrenode"
+__copyright__ = "rrenode"
+__license__ = "MIT"
+
+
+class WeightedNode(Node):
+    weight: float = 0.0
+
+
+def test_save_load_keeps_non_finite_floats(tmp_path):
+    g = Graph()
+    weights = {"nan": math.nan, "inf": math.inf, "ninf": -math.inf, "one": 1.5}
+    for name, weight in weights.items():
+        node = WeightedNode(name)
+        node.weight = weight
+        g.add_node(node)
+
+    path = tmp_path / "graph.json"
+    g.save(path)
+    loaded = Graph.load(path)
+
+    got = {n.name: n.weight for n in loaded.nodes}
+    assert math.isnan(got["nan"])
+    assert got["inf"] == math.inf
+    assert got["ninf"] == -math.inf
+    assert got["one"] == 1.5
+
+
+def test_save_falls_back_for_wide_ints(tmp_path):
+    g = Graph()
+    node = WeightedNode("big")
+    node.weight = 2**70  # wider than orjson accepts
+    g.add_node(node)
+
+    path = tmp_path / "graph.json"
+    g.save(path)
+    assert Graph.load(path).nodes[0].weight == 2**70
+    assert [p.name for p in tmp_path.iterdir()] == ["graph.json"]
+
+
+def test_dump_json_keeps_existing_file_on_error(tmp_path):
+    path = tmp_path / "graph.json"
+    path.write_text('{"old": true}')
+
+    with pytest.raises(TypeError):
+        dump_json({"value": object()}, path)
+
+    assert path.read_text() == '{"old": true}'
+    assert [p.name for p in tmp_path.iterdir()] == ["graph.json"]
+
+
+def test_save_load_keeps_cyclic_references(tmp_path):
+    # Restoring these relies on the handler swapping jsonpickle's placeholder
+    # for the real instance, which uses jsonpickle internals
+    g = Graph()
+    a, b, c = Node("a"), Node("b"), Node("c")
+    a.parent = b
+    b.parent = a  # parent cycle
+    c.parent = c  # self-parent
+    for node in (a, b, c):
+        g.add_node(node)
+    g.add_edge(Edge("ab", a, b))
+    g.add_edge(Edge("ba", b, a))
+    g.add_edge(Edge("cc", c, c))
+
+    path = tmp_path / "graph.json"
+    g.save(path)
+    loaded = Graph.load(path)
+
+    la, lb, lc = loaded.nodes
+    assert (la.name, lb.name, lc.name) == ("a", "b", "c")
+    assert la.parent is lb and lb.parent is la and lc.parent is lc
+    ab, ba, cc = loaded.edges
+    assert ab.node_a is la and ab.node_b is lb
+    assert ba.node_a is lb and ba.node_b is la
+    assert cc.node_a is lc and cc.node_b is lc
+    assert loaded.get_children(la) == [lb]
+    assert loaded.get_children(lc) == [lc]
+    assert loaded.get_edges_from(la) == [ab]
+
+
+class OddNode(Node):
+    pass
+
+
+def test_load_keeps_unresolvable_nodes_unindexed(tmp_path):
+    g = Graph()
+    a, odd = Node("a"), OddNode("odd")
+    g.add_node(a)
+    g.add_node(odd)
+    g.add_edge(Edge("e", a, odd))
+    path = tmp_path / "graph.json"
+    g.save(path)
+    path.write_text(path.read_text().replace(f"{__name__}.OddNode", "zzqq_gone.Qwxyz"))
+
+    with pytest.warns(UserWarning):
+        loaded = Graph.load(path)
+
+    assert isinstance(loaded.nodes[1], dict)
+    assert loaded.get_node_by_name("a") is loaded.nodes[0]
+    assert loaded.get_edges_from(loaded.nodes[0]) == []
+
+
+def test_save_empty_dict_nodes_check(tmp_path):
+    # An empty graph is fine; only a node list made up entirely of empty dicts is malformed
+    Graph().save(tmp_path / "empty.json", raise_empty_nodes_error=True)
+    assert Graph.load(tmp_path / "empty.json").nodes == []
+
+    g = Graph()
+    g.nodes.append({})
+    with pytest.raises(ValueError):
+        g.save(tmp_path / "bad.json", raise_empty_nodes_error=True)
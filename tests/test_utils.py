@@ -0,0 +1,67 @@
+import random
+import sys
+import types
+
+from nodedb.utils import generate_name_alias, get_all_classes_from_loaded_modules
+
+__author__ = "rrenode"
+__copyright__ = "rrenode"
+__license__ = "MIT"
+
+
+def _fake_module(monkeypatch, name):
+    module = types.ModuleType(name)
+    cls = type(f"K_{name}", (), {"__module__": name})
+    setattr(module, cls.__name__, cls)
+    monkeypatch.setitem(sys.modules, name, module)
+    return cls
+
+
+def test_class_scan_sees_modules_after_removals(monkeypatch):
+    _fake_module(monkeypatch, "nodedb_test_pa")
+    assert "nodedb_test_pa.K_nodedb_test_pa" in get_all_classes_from_loaded_modules()
+
+    # One module removed and two imported: the count only grows by one
+    monkeypatch.delitem(sys.modules, "nodedb_test_pa")
+    pb = _fake_module(monkeypatch, "nodedb_test_pb")
+    pc = _fake_module(monkeypatch, "nodedb_test_pc")
+
+    classes = get_all_classes_from_loaded_modules()
+    assert classes["nodedb_test_pb.K_nodedb_test_pb"] is pb
+    assert classes["nodedb_test_pc.K_nodedb_test_pc"] is pc
+
+    # A module that was removed and imported again is rescanned
+    monkeypatch.delitem(sys.modules, "nodedb_test_pc")
+    get_all_classes_from_loaded_modules()
+    pc = _fake_module(monkeypatch, "nodedb_test_pc")
+    assert get_all_classes_from_loaded_modules()["nodedb_test_pc.K_nodedb_test_pc"] is pc
+
+
+def _ref_generate_name_alias(name, min_length=3, max_length=3):
+    # The original per-character implementation
+    name = name.lower()
+    if '_' in name:
+        words = name.split('_')
+    elif ' ' in name:
+        words = name.split(' ')
+    else:
+        words = [name]
+
+    alias = ''.join([word[0] for word in words if word])
+    if len(alias) < min_length:
+        for word in words:
+            i = 1
+            while len(alias) < min_length and i < len(word):
+                alias += word[i]
+                i += 1
+    return alias[:max_length]
+
+
+def test_generate_name_alias_matches_reference():
+    rng = random.Random(3)
+    for _ in range(5000):
+        name = "".join(rng.choice("aB_ xyZ") for _ in range(rng.randint(0, 10)))
+        lo, hi = rng.randint(0, 6), rng.randint(0, 6)
+        assert generate_name_alias(name, lo, hi) == _ref_generate_name_alias(name, lo, hi), (name, lo, hi)
+    assert generate_name_alias("todo_app") == "tao"
+    assert generate_name_alias("build tools") == "btu"